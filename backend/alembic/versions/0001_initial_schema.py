@@ -0,0 +1,67 @@
+"""Initial schema
+
+Tables as created by ``Base.metadata.create_all`` before migrations were
+introduced. Databases created that way should be stamped with this
+revision (``alembic stamp 0001``) rather than upgraded through it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "patients",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("patient_id", sa.String(length=100), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=False),
+        sa.Column("gender", sa.String(length=20), nullable=False),
+        sa.Column("clinical_notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_patients_id", "patients", ["id"], unique=False)
+    op.create_index("ix_patients_patient_id", "patients", ["patient_id"], unique=True)
+
+    op.create_table(
+        "predictions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("patient_id", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("has_alzheimer", sa.Integer(), nullable=True),
+        sa.Column("confidence_score", sa.Float(), nullable=True),
+        sa.Column("risk_level", sa.String(length=20), nullable=True),
+        sa.Column("processing_time", sa.Float(), nullable=True),
+        sa.Column("model_version", sa.String(length=50), nullable=True),
+        sa.Column("result_data", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("image_path", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_predictions_id", "predictions", ["id"], unique=False)
+    op.create_index("ix_predictions_patient_id", "predictions", ["patient_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_predictions_patient_id", table_name="predictions")
+    op.drop_index("ix_predictions_id", table_name="predictions")
+    op.drop_table("predictions")
+    op.drop_index("ix_patients_patient_id", table_name="patients")
+    op.drop_index("ix_patients_id", table_name="patients")
+    op.drop_table("patients")
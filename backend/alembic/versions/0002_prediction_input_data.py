@@ -0,0 +1,30 @@
+"""Request payload of queued predictions
+
+Async-mode ``/predict`` stores the request in ``predictions.input_data``
+for the background scheduler to run later.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("predictions", sa.Column("input_data", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("predictions") as batch_op:
+        batch_op.drop_column("input_data")
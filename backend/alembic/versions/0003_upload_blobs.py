@@ -0,0 +1,44 @@
+"""Content-addressed uploads
+
+One row per stored file, keyed by the SHA-256 of its content, with the
+number of uploads that reference it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_blobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("last_uploaded_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("filename"),
+    )
+    op.create_index("ix_upload_blobs_id", "upload_blobs", ["id"], unique=False)
+    op.create_index("ix_upload_blobs_content_hash", "upload_blobs", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_upload_blobs_content_hash", table_name="upload_blobs")
+    op.drop_index("ix_upload_blobs_id", table_name="upload_blobs")
+    op.drop_table("upload_blobs")
@@ -0,0 +1,35 @@
+"""Composite indexes for keyset pagination of predictions
+
+``/results`` pages by ``(created_at, id)`` and ``/results/patient/{id}``
+by ``(patient_id, created_at, id)``. The single-column ``patient_id``
+index is a prefix of the latter and is dropped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_predictions_created_at_id", "predictions", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_predictions_patient_id_created_at_id", "predictions", ["patient_id", "created_at", "id"], unique=False
+    )
+    op.drop_index("ix_predictions_patient_id", table_name="predictions")
+
+
+def downgrade() -> None:
+    op.create_index("ix_predictions_patient_id", "predictions", ["patient_id"], unique=False)
+    op.drop_index("ix_predictions_patient_id_created_at_id", table_name="predictions")
+    op.drop_index("ix_predictions_created_at_id", table_name="predictions")
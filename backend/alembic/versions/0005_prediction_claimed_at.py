@@ -0,0 +1,30 @@
+"""Claim time of queued predictions
+
+The scheduler records when it claimed a queued prediction, so rows left
+PROCESSING by a worker that crashed can be reclaimed.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("predictions", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("predictions") as batch_op:
+        batch_op.drop_column("claimed_at")
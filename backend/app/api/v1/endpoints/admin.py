@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any
+from app.core.profiling import get_request_profiler
+
+router = APIRouter()
+
+
+def _require_profiling():
+    if not get_request_profiler().enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is disabled (set PROFILING_ENABLED=true)"
+        )
+
+
+@router.get("/admin/profiles", response_model=Dict[str, Any])
+async def list_profiles():
+    """
+    List recently captured request profiles, newest first
+    """
+    _require_profiling()
+    profiler = get_request_profiler()
+    return {
+        "sample_rate": profiler.sample_rate,
+        "default_mode": profiler.default_mode,
+        "profiles": profiler.recent(),
+    }
+
+
+@router.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: int):
+    """
+    Report of one profile
+
+    ``cprofile`` profiles are pstats text sorted by cumulative time;
+    ``stack`` profiles are folded stacks (``frame;frame;... count``), which
+    flamegraph.pl and speedscope read directly.
+    """
+    _require_profiling()
+    profile = get_request_profiler().get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return PlainTextResponse(profile["report"])
+
+
+@router.delete("/admin/profiles", response_model=Dict[str, Any])
+async def clear_profiles():
+    """
+    Discard all stored profiles
+    """
+    _require_profiling()
+    get_request_profiler().clear()
+    return {"message": "Profiles cleared"}
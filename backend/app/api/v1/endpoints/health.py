@@ -2,7 +2,17 @@ from fastapi import APIRouter
 from typing import Dict, Any
 from datetime import datetime
 from app.core.config import settings
-from app.services import get_ml_service
+from app.core.process_info import get_process_memory
+from app.core.startup import get_startup_timer
+from app.db.database import get_pool_stats
+from app.services import (
+    get_inference_executor,
+    get_model_registry,
+    get_model_rollout,
+    get_prediction_notifier,
+    get_response_cache,
+    get_result_cache,
+)
 
 router = APIRouter()
 
@@ -12,37 +22,28 @@ async def health_check():
     """
     Health check endpoint
 
-    Returns system status and configuration
+    Returns system status and configuration. Does not load the model, so
+    it answers while the model is still loading or warming up.
     """
-    ml_service = get_ml_service()
+    registry = get_model_registry()
+    ml_service = registry.peek()
 
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "version": settings.VERSION,
         "project_name": settings.PROJECT_NAME,
-        "model_loaded": ml_service.is_loaded,
-        "model_version": ml_service.model_version,
+        "model_loaded": ml_service is not None and ml_service.is_loaded,
+        "model_version": ml_service.model_version if ml_service is not None else registry.active_version,
+        "model": ml_service.stats() if ml_service is not None else None,
+        "startup": get_startup_timer().stats(),
+        "models": registry.stats(),
+        "rollout": get_model_rollout().stats(),
+        "inference": get_inference_executor().stats(),
+        "result_cache": get_result_cache().stats(),
+        "response_cache": get_response_cache().stats(),
+        "waiters": get_prediction_notifier().stats(),
+        "database": get_pool_stats(),
+        "process": get_process_memory(),
     }
 
-
-@router.get("/models", response_model=Dict[str, Any])
-async def list_models():
-    """
-    List available ML models and their information
-    """
-    ml_service = get_ml_service()
-
-    return {
-        "models": [
-            {
-                "name": "alzheimer-detection-v1",
-                "version": ml_service.model_version,
-                "status": "loaded" if ml_service.is_loaded else "placeholder",
-                "description": "Alzheimer's disease detection model",
-                "accuracy": 0.894 if ml_service.is_loaded else None,
-                "is_placeholder": not ml_service.is_loaded,
-            }
-        ],
-        "active_model": ml_service.model_version,
-    }
@@ -0,0 +1,137 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any
+from app.schemas.model import ModelRolloutConfig
+from app.services import get_model_registry, get_model_rollout, get_result_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _not_found(version: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Model version {version} not found"
+    )
+
+
+def _load_failed(error: ValueError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error))
+
+
+@router.get("/models", response_model=Dict[str, Any])
+async def list_models():
+    """
+    List known model versions with their load status, memory use and
+    time since last use
+    """
+    registry = get_model_registry()
+    await run_in_threadpool(registry.discover)
+
+    stats = registry.stats()
+    return {
+        "models": registry.describe(),
+        "active_model": registry.active_version,
+        "memory_bytes": stats["memory_bytes"],
+        "memory_budget_bytes": stats["memory_budget_bytes"],
+    }
+
+
+@router.get("/models/rollout", response_model=Dict[str, Any])
+async def get_rollout():
+    """
+    Current canary and shadow configuration
+    """
+    return get_model_rollout().stats()
+
+
+@router.put("/models/rollout", response_model=Dict[str, Any])
+async def configure_rollout(config: ModelRolloutConfig):
+    """
+    Set the canary and shadow versions
+
+    The canary serves ``canary_percent`` of requests that do not name a
+    version, picked by patient id so each patient sticks to one model.
+    The shadow version runs after each sampled prediction without
+    delaying the response; its result is stored under
+    ``result_data["shadow"]``. Send nulls to switch either off.
+    """
+    rollout = get_model_rollout()
+    try:
+        await run_in_threadpool(
+            rollout.configure,
+            config.canary_version,
+            config.canary_percent,
+            config.shadow_version,
+            config.shadow_sample_rate,
+        )
+    except KeyError as e:
+        raise _not_found(e.args[0])
+
+    return rollout.stats()
+
+
+@router.post("/models/{version}/load", response_model=Dict[str, Any])
+async def load_model(
+    version: str,
+    activate: bool = Query(False, description="Make this version active once it is loaded")
+):
+    """
+    Load (or reload) a model version and warm it up
+
+    The new instance replaces the old one only when it is ready; requests
+    in flight finish on the instance they started with. When the model file
+    is missing or broken the previous instance stays and the call fails
+    with 500. Reloading clears
+    the result cache, since cached results may come from the old weights.
+    With a process-pool executor each worker loads the version on first use.
+    """
+    registry = get_model_registry()
+    reload = registry.peek(version) is not None
+    try:
+        await run_in_threadpool(registry.load, version)
+        if activate:
+            await run_in_threadpool(registry.activate, version)
+    except KeyError:
+        raise _not_found(version)
+    except ValueError as e:
+        raise _load_failed(e)
+
+    if reload:
+        get_result_cache().clear()
+    return {"message": f"Model {version} loaded", "active_model": registry.active_version}
+
+
+@router.post("/models/{version}/activate", response_model=Dict[str, Any])
+async def activate_model(version: str):
+    """
+    Serve requests that do not name a version with this one, loading it
+    first if needed
+    """
+    registry = get_model_registry()
+    try:
+        await run_in_threadpool(registry.activate, version)
+    except KeyError:
+        raise _not_found(version)
+    except ValueError as e:
+        raise _load_failed(e)
+
+    return {"message": f"Model {version} is now active", "active_model": registry.active_version}
+
+
+@router.delete("/models/{version}", response_model=Dict[str, Any])
+async def unload_model(version: str):
+    """
+    Unload a model version to free its memory; it is loaded again on next use
+    """
+    registry = get_model_registry()
+    if version not in registry.versions():
+        raise _not_found(version)
+    try:
+        unloaded = registry.unload(version)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    return {"message": f"Model {version} {'unloaded' if unloaded else 'was not loaded'}"}
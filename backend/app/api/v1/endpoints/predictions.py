@@ -1,26 +1,319 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from sqlalchemy.sql import Select
+from datetime import date, datetime, time as dt_time, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+import csv
+import io
+import json
+import orjson
+import time
 
-from app.db.database import get_db
+from app.db.database import (
+    get_db,
+    get_read_db,
+    fetch_first,
+    fetch_rows,
+    read_session,
+    commit_with_retry,
+    ReadSession,
+    SessionLocal,
+)
 from app.schemas.prediction import (
     PredictionRequest,
     PredictionResponse,
+    PredictionBatchItem,
+    PredictionBatchResponse,
     PredictionStatus,
-    PredictionResult,
 )
+from app.core.config import settings
 from app.models.prediction import Prediction
-from app.services import get_ml_service
+from app.services import (
+    get_inference_executor,
+    get_model_rollout,
+    get_prediction_batcher,
+    get_prediction_notifier,
+    get_prediction_scheduler,
+    get_response_cache,
+    get_result_cache,
+    run_prediction_batch,
+    etag_matches,
+    CachedResponse,
+    prediction_cache_key,
+    apply_prediction_result,
+    mark_prediction_failed,
+    InferenceQueueFull,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+MAX_PAGE_SIZE = 1000
+
+# Columns of GET /results/export, in CSV column order
+EXPORT_COLUMNS = (
+    Prediction.id,
+    Prediction.patient_id,
+    Prediction.status,
+    Prediction.has_alzheimer,
+    Prediction.confidence_score,
+    Prediction.risk_level,
+    Prediction.processing_time,
+    Prediction.model_version,
+    Prediction.error_message,
+    Prediction.image_path,
+    Prediction.created_at,
+    Prediction.completed_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+# Statuses after which a prediction row no longer changes
+FINAL_STATUSES = (PredictionStatus.COMPLETED.value, PredictionStatus.FAILED.value)
+
+# Columns PredictionResponse is built from; read endpoints select only these (see _response_content)
+RESPONSE_COLUMNS = (
+    Prediction.id,
+    Prediction.patient_id,
+    Prediction.status,
+    Prediction.has_alzheimer,
+    Prediction.confidence_score,
+    Prediction.risk_level,
+    Prediction.processing_time,
+    Prediction.model_version,
+    Prediction.error_message,
+    Prediction.created_at,
+    Prediction.completed_at,
+)
+
+
+def _commit(db: Session, prediction: Prediction) -> None:
+    """Persist pending changes, reload the prediction row and drop its patient's cached history"""
+    db.add(prediction)
+    commit_with_retry(db)
+    db.refresh(prediction)
+    get_response_cache().invalidate_patient(prediction.patient_id)
+
+
+async def _save(db: Session, prediction: Prediction) -> None:
+    """``_commit`` in the threadpool, then wake clients waiting on the prediction"""
+    await run_in_threadpool(_commit, db, prediction)
+    get_prediction_notifier().publish(prediction.id)
+
+
+async def _load_result(db: ReadSession, prediction_id: int) -> Tuple[Optional[CachedResponse], bool]:
+    """
+    Serialized prediction and whether it is final (completed or failed)
+
+    Final predictions are served from and stored in the response cache.
+    Returns (None, False) for unknown ids.
+    """
+    cache = get_response_cache()
+    cached = cache.get_prediction(prediction_id)
+    if cached is not None:
+        return cached, True
+
+    rows = await fetch_rows(db, select(*RESPONSE_COLUMNS).where(Prediction.id == prediction_id))
+    if not rows:
+        return None, False
+
+    cached = CachedResponse(_encode(_response_content(rows[0])))
+    final = rows[0].status in FINAL_STATUSES
+    if final:
+        cache.put_prediction(prediction_id, cached)
+    return cached, final
+
+
+async def _read_result(prediction_id: int) -> Tuple[Optional[CachedResponse], bool]:
+    """``_load_result`` on a short-lived read session, for handlers that wait between reads"""
+    async with read_session() as db:
+        return await _load_result(db, prediction_id)
+
+
+def _not_found(prediction_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Prediction {prediction_id} not found"
+    )
+
+
+def _keyset_page(statement: Select, cursor: Optional[int], limit: int) -> Select:
+    """
+    Query for one page of predictions, newest first, after the ``cursor`` prediction
+
+    Rows are ordered by ``(created_at, id)`` and the page starts strictly
+    after the cursor row's position, so the database seeks on the
+    composite index instead of skipping rows. The cursor row's key is read
+    back by primary key in a subquery, which keeps the comparison in the
+    database's own datetime representation.
+    """
+    if cursor is not None:
+        cursor_key = (
+            select(Prediction.created_at, Prediction.id)
+            .where(Prediction.id == cursor)
+            .scalar_subquery()
+        )
+        statement = statement.where(tuple_(Prediction.created_at, Prediction.id) < cursor_key)
+
+    return (
+        statement
+        .order_by(Prediction.created_at.desc(), Prediction.id.desc())
+        .limit(limit)
+    )
+
+
+async def _check_cursor(db: ReadSession, cursor: Optional[int], rows: List[Any]):
+    """
+    400 for a cursor that names no prediction
+
+    Its key subquery is NULL, which matches no rows, so the page would
+    come back empty as if the listing had ended. Only empty pages are
+    checked.
+    """
+    if cursor is None or rows:
+        return
+    if await fetch_first(db, select(Prediction.id).where(Prediction.id == cursor)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor {cursor}: no such prediction",
+        )
+
+
+def _response_content(row) -> Dict[str, Any]:
+    """
+    PredictionResponse document for a row of RESPONSE_COLUMNS
+
+    Rows come from our own table, so they are mapped straight to the
+    response shape instead of being validated into models first; this is
+    about 20x faster for a page of results. ``benchmarks.serialization``
+    checks the output against the PredictionResponse path.
+    """
+    (prediction_id, patient_id, prediction_status, has_alzheimer, confidence_score, risk_level,
+     processing_time, model_version, error_message, created_at, completed_at) = row
+    result = None
+    if prediction_status == PredictionStatus.COMPLETED.value:
+        result = {
+            "has_alzheimer": bool(has_alzheimer),
+            "confidence_score": confidence_score,
+            "risk_level": risk_level,
+            "processing_time": processing_time,
+            "model_version": model_version,
+        }
+    return {
+        "id": prediction_id,
+        "patient_id": patient_id,
+        "status": prediction_status,
+        "result": result,
+        "error_message": error_message,
+        "created_at": created_at,
+        "completed_at": completed_at,
+    }
+
 
-@router.post("/predict", response_model=PredictionResponse, status_code=status.HTTP_201_CREATED)
+def _encode(content: Any) -> bytes:
+    """JSON with datetimes formatted as pydantic does (UTC as ``Z``)"""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def _serialize_rows(rows: List[Any]) -> bytes:
+    """JSON list of PredictionResponse for selected prediction rows, without building models"""
+    return _encode([_response_content(row) for row in rows])
+
+
+def _next_cursor_headers(predictions: List[Any], limit: int) -> Dict[str, str]:
+    """Expose the cursor for the following page when this one is full"""
+    if len(predictions) == limit:
+        return {"X-Next-Cursor": str(predictions[-1].id)}
+    return {}
+
+
+def _conditional_response(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """The serialized body with its ETag, or an empty 304 when the client already has it"""
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": cached.etag, **cached.headers})
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, **cached.headers},
+    )
+
+
+def _patient_data(request: PredictionRequest) -> dict:
+    """Model input fields from a prediction request"""
+    return {
+        "patient_id": request.patient_id,
+        "age": request.age,
+        "gender": request.gender,
+        "clinical_notes": request.clinical_notes,
+    }
+
+
+def _model_version(request: PredictionRequest) -> str:
+    """Model version that serves a request (canary routing applies); 404 for unknown versions"""
+    try:
+        return get_model_rollout().route(request.model_version, request.patient_id)[0]
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model version {request.model_version} not found",
+        )
+
+
+async def _result_cache_key(request: PredictionRequest, model_version: str) -> str:
+    """Result cache key for a request; hashing a legacy image file runs in the threadpool"""
+    patient_data = _patient_data(request)
+    if request.image_path:
+        return await run_in_threadpool(prediction_cache_key, patient_data, request.image_path, model_version)
+    return prediction_cache_key(patient_data, None, model_version)
+
+
+async def _cached_prediction(request: PredictionRequest, cached: dict, db: Session) -> PredictionResponse:
+    """Record a prediction served from the result cache"""
+    started = time.perf_counter()
+    prediction = Prediction(
+        patient_id=request.patient_id,
+        image_path=request.image_path,
+    )
+    apply_prediction_result(prediction, {
+        **cached,
+        "processing_time": round(time.perf_counter() - started, 3),
+        "cache_hit": True,
+    })
+    await _save(db, prediction)
+
+    logger.info(f"Prediction {prediction.id} for patient {request.patient_id} served from cache")
+    return PredictionResponse.model_validate(prediction)
+
+
+async def _enqueue_prediction(request: PredictionRequest, model_version: str, db: Session) -> PredictionResponse:
+    """Store a PENDING prediction for the background scheduler"""
+    prediction = Prediction(
+        patient_id=request.patient_id,
+        status=PredictionStatus.PENDING.value,
+        image_path=request.image_path,
+        input_data={**_patient_data(request), "image_path": request.image_path, "model_version": model_version},
+    )
+    await _save(db, prediction)
+    get_prediction_scheduler().notify()
+
+    logger.info(f"Queued prediction {prediction.id} for patient {request.patient_id}")
+    return PredictionResponse.model_validate(prediction)
+
+
+@router.post(
+    "/predict",
+    response_model=PredictionResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": PredictionResponse, "description": "Prediction queued"}},
+)
 async def create_prediction(
     request: PredictionRequest,
+    response: Response,
+    async_mode: bool = Query(False, description="Queue the prediction and return 202 immediately"),
+    bypass_cache: bool = Query(False, description="Skip the result cache lookup and run inference"),
     db: Session = Depends(get_db)
 ):
     """
@@ -28,7 +321,48 @@ async def create_prediction(
 
     This endpoint accepts patient data and optionally medical imaging data,
     runs the ML model inference, and returns the prediction results.
+
+    With ``async_mode=true`` the prediction is stored as PENDING and the
+    endpoint returns 202 with its id right away; a background scheduler runs
+    inference and clients poll ``/results/{id}`` or ``/results/{id}/wait``.
+
+    ``model_version`` selects a loaded (or loadable) model version; the
+    active version (or, for a share of patients, the canary version)
+    serves requests without one. Unknown versions get 404. When a shadow
+    version is configured it runs on the same input after the response
+    is ready and its result is stored in the prediction's result_data.
+
+    Identical requests (same fields, image content and model version) are
+    served from the result cache unless ``bypass_cache=true``; a cache hit
+    still records a Prediction row.
+
+    Inference is micro-batched with concurrent requests and runs on the
+    bounded inference executor, and database writes run in the threadpool,
+    so the event loop stays free for other requests. Returns 503 when the
+    inference queue is full.
     """
+    model_version = _model_version(request)
+
+    if async_mode:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await _enqueue_prediction(request, model_version, db)
+
+    cache = get_result_cache()
+    cache_key = await _result_cache_key(request, model_version) if cache.enabled else None
+    if cache_key and not bypass_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return await _cached_prediction(request, cached, db)
+
+    executor = get_inference_executor()
+    if executor.is_saturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inference queue is full, please retry later",
+            headers={"Retry-After": "1"},
+        )
+
+    prediction = None
     try:
         # Create initial prediction record
         prediction = Prediction(
@@ -36,63 +370,39 @@ async def create_prediction(
             status=PredictionStatus.PROCESSING.value,
             image_path=request.image_path,
         )
-        db.add(prediction)
-        db.commit()
-        db.refresh(prediction)
+        await _save(db, prediction)
 
         logger.info(f"Created prediction {prediction.id} for patient {request.patient_id}")
 
-        # Get ML service and make prediction
-        ml_service = get_ml_service()
-
-        # Prepare patient data
-        patient_data = {
-            "patient_id": request.patient_id,
-            "age": request.age,
-            "gender": request.gender,
-            "clinical_notes": request.clinical_notes,
-        }
-
-        # Run prediction
-        result = ml_service.predict(patient_data, request.image_path)
+        # Run prediction (micro-batched with concurrent requests)
+        result = await get_prediction_batcher().submit(_patient_data(request), request.image_path, model_version)
 
         # Update prediction with results
-        prediction.status = PredictionStatus.COMPLETED.value
-        prediction.has_alzheimer = int(result["has_alzheimer"])
-        prediction.confidence_score = result["confidence_score"]
-        prediction.risk_level = result["risk_level"]
-        prediction.processing_time = result["processing_time"]
-        prediction.model_version = result["model_version"]
-        prediction.result_data = result
-        prediction.completed_at = datetime.utcnow()
-
-        db.commit()
-        db.refresh(prediction)
+        apply_prediction_result(prediction, result)
+        await _save(db, prediction)
+        if cache_key:
+            cache.put(cache_key, result)
+        get_model_rollout().shadow(prediction.id, _patient_data(request), request.image_path, result)
 
         logger.info(f"Prediction {prediction.id} completed successfully")
 
-        # Convert to response format
-        return PredictionResponse(
-            id=prediction.id,
-            patient_id=prediction.patient_id,
-            status=PredictionStatus(prediction.status),
-            result=PredictionResult(
-                has_alzheimer=bool(prediction.has_alzheimer),
-                confidence_score=prediction.confidence_score,
-                risk_level=prediction.risk_level,
-                processing_time=prediction.processing_time,
-                model_version=prediction.model_version,
-            ),
-            created_at=prediction.created_at,
-            completed_at=prediction.completed_at,
-        )
+        return PredictionResponse.model_validate(prediction)
 
+    except InferenceQueueFull as e:
+        mark_prediction_failed(prediction, str(e))
+        await _save(db, prediction)
+        logger.warning(f"Prediction {prediction.id} rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inference queue is full, please retry later",
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         # Update prediction status to failed
-        prediction.status = PredictionStatus.FAILED.value
-        prediction.error_message = str(e)
-        db.commit()
-        logger.error(f"Prediction {prediction.id} failed: {str(e)}")
+        if prediction:
+            mark_prediction_failed(prediction, str(e))
+            await _save(db, prediction)
+        logger.error(f"Prediction failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -100,9 +410,8 @@ async def create_prediction(
     except Exception as e:
         # Update prediction status to failed
         if prediction:
-            prediction.status = PredictionStatus.FAILED.value
-            prediction.error_message = str(e)
-            db.commit()
+            mark_prediction_failed(prediction, str(e))
+            await _save(db, prediction)
         logger.error(f"Unexpected error in prediction: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,113 +419,375 @@ async def create_prediction(
         )
 
 
-@router.get("/results/{prediction_id}", response_model=PredictionResponse)
-async def get_prediction_result(
-    prediction_id: int,
+# Columns written by the bulk insert in /predict/batch (id and created_at come back via RETURNING)
+BULK_INSERT_COLUMNS = [
+    column.key for column in Prediction.__table__.columns if column.key not in ("id", "created_at")
+]
+
+
+def _bulk_insert(db: Session, predictions: List[Prediction]) -> None:
+    """
+    Insert transient prediction rows in one transaction
+
+    The rows go through a Core INSERT ... RETURNING executed as multi-row
+    VALUES batches, so ids and created_at are filled in without the
+    per-row refresh the ORM would issue after commit. SQLAlchemy can only
+    keep RETURNING rows in parameter order on SQLite by inserting one row
+    at a time; there, the new rowids are allocated in VALUES order inside
+    the write transaction, so sorting by id restores the input order.
+    """
+    table = Prediction.__table__
+    rows = [{key: getattr(prediction, key) for key in BULK_INSERT_COLUMNS} for prediction in predictions]
+
+    def insert():
+        if db.get_bind().dialect.name == "sqlite":
+            statement = table.insert().returning(table.c.id, table.c.created_at)
+            return sorted(db.execute(statement, rows).all())
+        statement = table.insert().returning(table.c.id, table.c.created_at, sort_by_parameter_order=True)
+        return db.execute(statement, rows).all()
+
+    returned = commit_with_retry(db, work=insert)
+
+    for prediction, (prediction_id, created_at) in zip(predictions, returned):
+        prediction.id = prediction_id
+        prediction.created_at = created_at
+
+    cache = get_response_cache()
+    for patient_id in {prediction.patient_id for prediction in predictions}:
+        cache.invalidate_patient(patient_id)
+
+
+@router.post("/predict/batch", response_model=PredictionBatchResponse)
+async def create_prediction_batch(
+    requests: List[PredictionRequest],
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve prediction results by ID
+    Run predictions for many patients in one call
+
+    All requests go through the model in a single vectorized call, and
+    every Prediction row (completed or failed) is written with one bulk
+    insert in one transaction. Items that fail (e.g. an unreadable image)
+    are reported individually and do not fail the rest of the batch.
+    Items naming different model versions run as one call per version.
+    Returns 503 when the inference queue is full.
     """
-    prediction = db.query(Prediction).filter(Prediction.id == prediction_id).first()
+    if not requests:
+        return PredictionBatchResponse(total=0, completed=0, failed=0, items=[])
+    if len(requests) > settings.PREDICTION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds maximum of {settings.PREDICTION_BATCH_MAX_ITEMS} predictions",
+        )
 
-    if not prediction:
+    executor = get_inference_executor()
+    if executor.is_saturated:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Prediction {prediction_id} not found"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inference queue is full, please retry later",
+            headers={"Retry-After": "1"},
         )
 
-    # Convert to response format
-    result = None
-    if prediction.status == PredictionStatus.COMPLETED.value:
-        result = PredictionResult(
-            has_alzheimer=bool(prediction.has_alzheimer),
-            confidence_score=prediction.confidence_score,
-            risk_level=prediction.risk_level,
-            processing_time=prediction.processing_time,
-            model_version=prediction.model_version,
+    results: List[Any] = [None] * len(requests)
+    by_version: Dict[str, List[int]] = {}
+    for i, request in enumerate(requests):
+        try:
+            model_version = get_model_rollout().route(request.model_version, request.patient_id)[0]
+        except KeyError:
+            results[i] = ValueError(f"Model version {request.model_version} not found")
+            continue
+        by_version.setdefault(model_version, []).append(i)
+
+    for model_version, indices in by_version.items():
+        records = [_patient_data(requests[i]) for i in indices]
+        image_paths = [requests[i].image_path for i in indices]
+        try:
+            group_results = await executor.run(run_prediction_batch, records, image_paths, model_version)
+        except InferenceQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Inference queue is full, please retry later",
+                headers={"Retry-After": "1"},
+            )
+        except Exception as e:
+            # The whole vectorized call failed: every item of the group fails with the same error
+            logger.error(f"Batch prediction with model {model_version} failed: {str(e)}")
+            group_results = [e] * len(indices)
+        for i, result in zip(indices, group_results):
+            results[i] = result
+
+    predictions = []
+    for request, result in zip(requests, results):
+        prediction = Prediction(patient_id=request.patient_id, image_path=request.image_path)
+        if isinstance(result, Exception):
+            mark_prediction_failed(prediction, str(result))
+        else:
+            apply_prediction_result(prediction, result)
+        predictions.append(prediction)
+
+    await run_in_threadpool(_bulk_insert, db, predictions)
+
+    items = [
+        PredictionBatchItem(index=i, prediction=PredictionResponse.model_validate(prediction), error=prediction.error_message)
+        for i, prediction in enumerate(predictions)
+    ]
+    failed = sum(1 for item in items if item.error is not None)
+    logger.info(f"Batch of {len(items)} predictions stored ({failed} failed)")
+
+    return PredictionBatchResponse(total=len(items), completed=len(items) - failed, failed=failed, items=items)
+
+
+def _as_utc(value: Union[datetime, date]) -> datetime:
+    """
+    Timestamps are stored in UTC; dates mean midnight UTC and aware values
+    are converted before comparing
+    """
+    if not isinstance(value, datetime):
+        return datetime.combine(value, dt_time())
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc)
+    return value
+
+
+def _export_record(row) -> dict:
+    record = dict(zip(EXPORT_FIELDS, row))
+    if record["has_alzheimer"] is not None:
+        record["has_alzheimer"] = bool(record["has_alzheimer"])
+    for key in ("created_at", "completed_at"):
+        if record[key] is not None:
+            record[key] = record[key].isoformat()
+    return record
+
+
+def _iter_export(statement, export_format: str) -> Iterator[str]:
+    """
+    Stream export rows, one chunk of EXPORT_BATCH_SIZE rows at a time
+
+    Runs on its own session so the response can outlive the request's
+    dependencies. ``stream_results`` uses a server-side cursor where the
+    driver supports one, and ``yield_per`` keeps only one chunk of rows in
+    memory. Starlette iterates sync generators in the threadpool.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            statement.execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
         )
 
-    return PredictionResponse(
-        id=prediction.id,
-        patient_id=prediction.patient_id,
-        status=PredictionStatus(prediction.status),
-        result=result,
-        error_message=prediction.error_message,
-        created_at=prediction.created_at,
-        completed_at=prediction.completed_at,
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for rows in result.partitions():
+                writer.writerows(_export_record(row) for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for rows in result.partitions():
+                yield "".join(json.dumps(_export_record(row)) + "\n" for row in rows)
+    finally:
+        db.close()
+
+
+@router.get("/results/export")
+async def export_predictions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    patient_id: Optional[str] = None,
+    status_filter: Optional[PredictionStatus] = Query(None, alias="status"),
+    model_version: Optional[str] = None,
+    created_after: Optional[Union[datetime, date]] = Query(None, description="Inclusive lower bound on created_at"),
+    created_before: Optional[Union[datetime, date]] = Query(None, description="Exclusive upper bound on created_at"),
+):
+    """
+    Export every prediction matching the filters
+
+    Rows are streamed oldest first as NDJSON (one object per line) or CSV,
+    so memory use does not depend on how many rows match.
+    """
+    statement = select(*EXPORT_COLUMNS)
+    if patient_id is not None:
+        statement = statement.where(Prediction.patient_id == patient_id)
+    if status_filter is not None:
+        statement = statement.where(Prediction.status == status_filter.value)
+    if model_version is not None:
+        statement = statement.where(Prediction.model_version == model_version)
+    if created_after is not None:
+        statement = statement.where(Prediction.created_at >= _as_utc(created_after))
+    if created_before is not None:
+        statement = statement.where(Prediction.created_at < _as_utc(created_before))
+    statement = statement.order_by(Prediction.created_at, Prediction.id)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"predictions.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        _iter_export(statement, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/results/{prediction_id}", response_model=PredictionResponse)
+async def get_prediction_result(
+    prediction_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    Retrieve prediction results by ID
+
+    Completed and failed predictions are served from the response cache.
+    Responses carry an ETag; a request whose ``If-None-Match`` matches it
+    gets an empty 304.
+    """
+    cached, _ = await _load_result(db, prediction_id)
+    if cached is None:
+        raise _not_found(prediction_id)
+
+    return _conditional_response(cached, if_none_match)
+
+
+@router.get("/results/{prediction_id}/wait", response_model=PredictionResponse)
+async def wait_for_prediction_result(
+    prediction_id: int,
+    timeout: float = Query(10.0, ge=0, description="Seconds to wait for completion"),
+):
+    """
+    Long-poll for a prediction result
+
+    Returns as soon as the prediction is completed or failed, or with its
+    current status once ``timeout`` (capped by PREDICTION_LONG_POLL_TIMEOUT)
+    has passed. The handler sleeps until the inference path publishes a
+    change of the prediction rather than polling the database; it only
+    re-checks the row every PREDICTION_WAIT_RECHECK_SECONDS, for
+    predictions completed by another worker.
+    """
+    deadline = time.monotonic() + min(timeout, settings.PREDICTION_LONG_POLL_TIMEOUT)
+
+    with get_prediction_notifier().subscribe(prediction_id) as subscription:
+        while True:
+            cached, final = await _read_result(prediction_id)
+            if cached is None:
+                raise _not_found(prediction_id)
+
+            remaining = deadline - time.monotonic()
+            if final or remaining <= 0:
+                return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
+
+            await subscription.wait(min(remaining, settings.PREDICTION_WAIT_RECHECK_SECONDS))
+
+
+def _sse_event(event: str, data: bytes) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+async def _prediction_events(prediction_id: int) -> AsyncIterator[bytes]:
+    """
+    SSE stream of a prediction: one ``prediction`` event per status change,
+    ending after the completed or failed state (or PREDICTION_EVENTS_TIMEOUT)
+
+    Comment lines keep idle connections open through proxies while the
+    prediction has not changed.
+    """
+    deadline = time.monotonic() + settings.PREDICTION_EVENTS_TIMEOUT
+    with get_prediction_notifier().subscribe(prediction_id) as subscription:
+        cached, final = await _read_result(prediction_id)
+        sent = None
+        while True:
+            if cached is not None and cached.etag != sent:
+                yield _sse_event("prediction", cached.body)
+                sent = cached.etag
+            remaining = deadline - time.monotonic()
+            if final or cached is None or remaining <= 0:
+                return
+
+            if not await subscription.wait(min(remaining, settings.PREDICTION_WAIT_RECHECK_SECONDS)):
+                yield b": keep-alive\n\n"
+            cached, final = await _read_result(prediction_id)
+
+
+@router.get(
+    "/results/{prediction_id}/events",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def stream_prediction_events(prediction_id: int):
+    """
+    Server-sent events for a prediction
+
+    Sends the current state as a ``prediction`` event (the same JSON as
+    ``/results/{id}``), then one more each time its status changes, and
+    closes the stream once it is completed or failed. Like ``/wait``, it
+    is woken by the inference path instead of polling the database.
+    """
+    cached, _ = await _read_result(prediction_id)
+    if cached is None:
+        raise _not_found(prediction_id)
+
+    return StreamingResponse(
+        _prediction_events(prediction_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.get("/results/patient/{patient_id}", response_model=List[PredictionResponse])
 async def get_patient_predictions(
     patient_id: str,
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Id of the last prediction on the previous page"),
+    if_none_match: Optional[str] = Header(None),
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Retrieve all predictions for a specific patient
+
+    Newest first. Pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to get the next page.
+
+    Pages are served from the response cache until a prediction of the
+    patient is written. Responses carry an ETag; a request whose
+    ``If-None-Match`` matches it gets an empty 304.
     """
-    predictions = (
-        db.query(Prediction)
-        .filter(Prediction.patient_id == patient_id)
-        .order_by(Prediction.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+    cache = get_response_cache()
+    cached = cache.get_history(patient_id, limit, cursor)
+    if cached is None:
+        token = cache.token()
+        statement = select(*RESPONSE_COLUMNS).where(Prediction.patient_id == patient_id)
+        rows = await fetch_rows(db, _keyset_page(statement, cursor, limit))
+        await _check_cursor(db, cursor, rows)
+        cached = CachedResponse(_serialize_rows(rows), _next_cursor_headers(rows, limit))
+        cache.put_history(patient_id, limit, cursor, cached, token)
 
-    return [
-        PredictionResponse(
-            id=p.id,
-            patient_id=p.patient_id,
-            status=PredictionStatus(p.status),
-            result=PredictionResult(
-                has_alzheimer=bool(p.has_alzheimer),
-                confidence_score=p.confidence_score,
-                risk_level=p.risk_level,
-                processing_time=p.processing_time,
-                model_version=p.model_version,
-            ) if p.status == PredictionStatus.COMPLETED.value else None,
-            error_message=p.error_message,
-            created_at=p.created_at,
-            completed_at=p.completed_at,
-        )
-        for p in predictions
-    ]
+    return _conditional_response(cached, if_none_match)
 
 
 @router.get("/results", response_model=List[PredictionResponse])
 async def list_predictions(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    skip: int = Query(0, ge=0, description="Offset pagination (deprecated, use cursor)"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = Query(None, description="Id of the last prediction on the previous page"),
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     List all predictions with pagination
+
+    Newest first. Pass the ``X-Next-Cursor`` response header back as
+    ``cursor`` to get the next page; unlike ``skip``, the cost of a page
+    does not grow with its depth.
     """
-    predictions = (
-        db.query(Prediction)
-        .order_by(Prediction.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    statement = select(*RESPONSE_COLUMNS)
+    if cursor is None and skip:
+        statement = statement.order_by(Prediction.created_at.desc(), Prediction.id.desc()).offset(skip).limit(limit)
+    else:
+        statement = _keyset_page(statement, cursor, limit)
+    rows = await fetch_rows(db, statement)
+    await _check_cursor(db, cursor, rows)
 
-    return [
-        PredictionResponse(
-            id=p.id,
-            patient_id=p.patient_id,
-            status=PredictionStatus(p.status),
-            result=PredictionResult(
-                has_alzheimer=bool(p.has_alzheimer),
-                confidence_score=p.confidence_score,
-                risk_level=p.risk_level,
-                processing_time=p.processing_time,
-                model_version=p.model_version,
-            ) if p.status == PredictionStatus.COMPLETED.value else None,
-            error_message=p.error_message,
-            created_at=p.created_at,
-            completed_at=p.completed_at,
-        )
-        for p in predictions
-    ]
+    return Response(
+        content=_serialize_rows(rows),
+        media_type="application/json",
+        headers=_next_cursor_headers(rows, limit),
+    )
@@ -1,11 +1,22 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 from typing import Dict, Any, List
-import os
-import shutil
 from pathlib import Path
+import asyncio
 import logging
 
 from app.core.config import settings
+from app.db.database import get_db, SessionLocal
+from app.services import (
+    get_upload_session_store,
+    release_blob,
+    save_stream,
+    save_upload_file,
+    UploadSessionError,
+    UploadTooLarge,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -17,23 +28,37 @@ def validate_file_extension(filename: str) -> bool:
     return ext in settings.ALLOWED_EXTENSIONS
 
 
-def get_file_size(file: UploadFile) -> int:
-    """Get file size in bytes"""
-    file.file.seek(0, 2)  # Seek to end
-    size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
-    return size
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
+    )
+
+
+def _check_content_length(request: Request):
+    """Reject oversized bodies up front when the client declares their size"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_UPLOAD_SIZE:
+        raise _too_large()
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., description="Original file name")
+    total_size: int = Field(..., gt=0, description="Total file size in bytes")
 
 
 @router.post("/upload", response_model=Dict[str, Any])
 async def upload_medical_file(
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
 ):
     """
     Upload medical imaging files (DICOM, NIfTI, JPEG, PNG, etc.)
 
     Accepts medical imaging data and stores it for processing.
     Returns the file path that can be used in prediction requests.
+    Files are stored by content hash, so re-uploading the same scan returns
+    the existing path (``deduplicated: true``) instead of a new copy.
     """
     try:
         # Validate file extension
@@ -43,35 +68,17 @@ async def upload_medical_file(
                 detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
             )
 
-        # Check file size
-        file_size = get_file_size(file)
-        if file_size > settings.MAX_UPLOAD_SIZE:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
-            )
-
-        # Create upload directory if it doesn't exist
-        upload_dir = Path(settings.UPLOAD_DIR)
-        upload_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate unique filename
-        timestamp = Path(file.filename).stem
-        extension = Path(file.filename).suffix
-        unique_filename = f"{timestamp}_{os.urandom(8).hex()}{extension}"
-        file_path = upload_dir / unique_filename
-
-        # Save file
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save file, enforcing the size limit while copying
+        try:
+            stored = await save_upload_file(file, db)
+        except UploadTooLarge:
+            raise _too_large()
 
-        logger.info(f"File uploaded successfully: {unique_filename}")
+        logger.info(f"File uploaded successfully: {stored['filename']}")
 
         return {
-            "filename": unique_filename,
+            **stored,
             "original_filename": file.filename,
-            "file_path": str(file_path),
-            "file_size": file_size,
             "content_type": file.content_type,
             "message": "File uploaded successfully",
         }
@@ -86,6 +93,27 @@ async def upload_medical_file(
         )
 
 
+async def _upload_batch_file(file: UploadFile, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Validate and store one file of a batch upload, reporting errors instead of raising"""
+    async with semaphore:
+        if not validate_file_extension(file.filename):
+            return {"filename": file.filename, "error": "Invalid file type"}
+
+        # Each concurrent upload gets its own session
+        db = SessionLocal()
+        try:
+            stored = await save_upload_file(file, db)
+        except UploadTooLarge:
+            return {"filename": file.filename, "error": "File too large"}
+        except Exception as e:
+            logger.error(f"Failed to upload {file.filename}: {str(e)}")
+            return {"filename": file.filename, "error": str(e)}
+        finally:
+            await run_in_threadpool(db.close)
+
+        return {**stored, "original_filename": file.filename}
+
+
 @router.post("/upload/batch", response_model=Dict[str, Any])
 async def upload_multiple_files(
     files: List[UploadFile] = File(...)
@@ -93,60 +121,23 @@ async def upload_multiple_files(
     """
     Upload multiple medical imaging files at once
 
-    Useful for uploading multiple scans or views for a single patient
+    Useful for uploading multiple scans or views for a single patient, such as
+    all sequences of an MRI study. The batch is limited by its total size
+    (MAX_BATCH_UPLOAD_SIZE) and files are stored concurrently, at most
+    UPLOAD_BATCH_CONCURRENCY at a time.
     """
-    if len(files) > 10:
+    total_size = sum(file.size or 0 for file in files)
+    if total_size > settings.MAX_BATCH_UPLOAD_SIZE:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 10 files per batch upload"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large. Maximum total size: {settings.MAX_BATCH_UPLOAD_SIZE / (1024*1024)}MB"
         )
 
-    uploaded_files = []
-    failed_files = []
+    semaphore = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+    outcomes = await asyncio.gather(*(_upload_batch_file(file, semaphore) for file in files))
 
-    for file in files:
-        try:
-            # Validate and upload each file
-            if not validate_file_extension(file.filename):
-                failed_files.append({
-                    "filename": file.filename,
-                    "error": "Invalid file type"
-                })
-                continue
-
-            file_size = get_file_size(file)
-            if file_size > settings.MAX_UPLOAD_SIZE:
-                failed_files.append({
-                    "filename": file.filename,
-                    "error": "File too large"
-                })
-                continue
-
-            # Upload file
-            upload_dir = Path(settings.UPLOAD_DIR)
-            upload_dir.mkdir(parents=True, exist_ok=True)
-
-            timestamp = Path(file.filename).stem
-            extension = Path(file.filename).suffix
-            unique_filename = f"{timestamp}_{os.urandom(8).hex()}{extension}"
-            file_path = upload_dir / unique_filename
-
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-
-            uploaded_files.append({
-                "filename": unique_filename,
-                "original_filename": file.filename,
-                "file_path": str(file_path),
-                "file_size": file_size,
-            })
-
-        except Exception as e:
-            logger.error(f"Failed to upload {file.filename}: {str(e)}")
-            failed_files.append({
-                "filename": file.filename,
-                "error": str(e)
-            })
+    uploaded_files = [outcome for outcome in outcomes if "error" not in outcome]
+    failed_files = [outcome for outcome in outcomes if "error" in outcome]
 
     return {
         "uploaded_count": len(uploaded_files),
@@ -156,12 +147,132 @@ async def upload_multiple_files(
     }
 
 
+@router.post("/upload/stream", response_model=Dict[str, Any])
+async def upload_medical_file_stream(
+    request: Request,
+    filename: str = Query(..., description="Original file name, used for type validation"),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload a medical imaging file as a raw request body
+
+    Unlike multipart ``/upload``, the body is written straight to its final
+    location as it arrives, and the upload is aborted with 413 as soon as it
+    passes MAX_UPLOAD_SIZE instead of after the whole body was received.
+    """
+    if not validate_file_extension(filename):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
+        )
+    _check_content_length(request)
+
+    try:
+        stored = await save_stream(request.stream(), filename, db)
+    except UploadTooLarge:
+        raise _too_large()
+    except Exception as e:
+        logger.error(f"Streaming upload failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File upload failed"
+        )
+
+    logger.info(f"File uploaded successfully: {stored['filename']}")
+
+    return {
+        **stored,
+        "original_filename": filename,
+        "content_type": request.headers.get("content-type"),
+        "message": "File uploaded successfully",
+    }
+
+
+@router.post("/upload/sessions", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_upload_session(session: UploadSessionCreate):
+    """
+    Start a resumable chunked upload
+
+    Send the file in order with ``PUT /upload/sessions/{upload_id}?offset=N``.
+    After a failure, ``GET /upload/sessions/{upload_id}`` returns the offset
+    to resume from.
+    """
+    if not validate_file_extension(session.filename):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
+        )
+
+    try:
+        return await run_in_threadpool(get_upload_session_store().create, session.filename, session.total_size)
+    except UploadTooLarge:
+        raise _too_large()
+
+
+@router.get("/upload/sessions/{upload_id}", response_model=Dict[str, Any])
+async def get_upload_session(upload_id: str):
+    """Get the current offset of a resumable upload"""
+    try:
+        session = await run_in_threadpool(get_upload_session_store().get, upload_id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    return session
+
+
+@router.put("/upload/sessions/{upload_id}", response_model=Dict[str, Any])
+async def upload_session_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    db: Session = Depends(get_db),
+):
+    """
+    Append a chunk to a resumable upload
+
+    ``offset`` must equal the session's current offset (409 otherwise).
+    The response carries the new offset; once it reaches ``total_size`` the
+    file is moved into the upload directory and ``file_path`` is returned.
+    """
+    try:
+        return await get_upload_session_store().append(upload_id, offset, request.stream(), db)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Chunk extends past the declared total size"
+        )
+    except UploadSessionError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/upload/sessions/{upload_id}")
+async def abort_upload_session(upload_id: str):
+    """Abort a resumable upload and discard the received data"""
+    try:
+        aborted = await run_in_threadpool(get_upload_session_store().abort, upload_id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not aborted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found")
+    return {"message": "Upload session aborted", "upload_id": upload_id}
+
+
 @router.delete("/upload/{filename}")
-async def delete_uploaded_file(filename: str):
+async def delete_uploaded_file(
+    filename: str,
+    db: Session = Depends(get_db)
+):
     """
     Delete an uploaded file
 
-    Use this to clean up uploaded files that are no longer needed
+    Use this to clean up uploaded files that are no longer needed.
+    Identical uploads share one stored file; it is only removed from disk
+    when the last upload referencing it is deleted.
     """
     try:
         file_path = Path(settings.UPLOAD_DIR) / filename
@@ -179,10 +290,18 @@ async def delete_uploaded_file(filename: str):
                 detail="Access denied"
             )
 
-        file_path.unlink()
-        logger.info(f"File deleted: {filename}")
+        remaining_references = await run_in_threadpool(release_blob, db, filename)
+        if remaining_references is None:
+            # Untracked file from before content-addressed storage
+            file_path.unlink()
+            remaining_references = 0
+        logger.info(f"File deleted: {filename} ({remaining_references} references left)")
 
-        return {"message": "File deleted successfully", "filename": filename}
+        return {
+            "message": "File deleted successfully",
+            "filename": filename,
+            "remaining_references": remaining_references,
+        }
 
     except HTTPException:
         raise
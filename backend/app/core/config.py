@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -17,14 +17,93 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "uploads/medical_images"
     MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024  # 500MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Disk write size for streamed uploads
+    MAX_BATCH_UPLOAD_SIZE: int = 2 * 1024 * 1024 * 1024  # 2GB total per /upload/batch request
+    UPLOAD_BATCH_CONCURRENCY: int = 4  # Files of a batch stored in parallel
+    UPLOAD_SESSION_TTL_SECONDS: float = 24 * 3600  # Resumable sessions idle this long are deleted
     ALLOWED_EXTENSIONS: List[str] = [".dcm", ".nii", ".nii.gz", ".jpg", ".jpeg", ".png", ".csv", ".json"]
 
     # Database
     DATABASE_URL: str = "sqlite:///./alzheimer_detection.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout (drops stale Postgres connections)
+    DB_LOCK_RETRIES: int = 3  # Commit retries on "database is locked"
+    DB_CREATE_TABLES: bool = True  # Create missing tables at startup; disable when Alembic manages the schema
+    DB_ASYNC_READS: bool = False  # Serve read endpoints from an async engine (needs aiosqlite or asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with its async driver
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
 
     # ML Model
     MODEL_PATH: str = "models/alzheimer_model.pkl"
     MODEL_VERSION: str = "v1.0.0"
+    MODEL_BACKEND: str = "auto"  # auto (by file extension), joblib or onnx
+    MODEL_MMAP_MODE: Optional[str] = "r"  # joblib mmap_mode for model arrays; empty loads into memory
+    MODEL_EAGER_LOAD: bool = True  # Load (and warm up) the model in the startup hook
+    MODEL_WARMUP: bool = True
+    MODEL_BACKGROUND_WARMUP: bool = False  # Load and warm up after startup, so /ping and /health answer at once
+    ONNX_INTRA_OP_THREADS: int = 0  # Threads per ONNX Runtime inference call; 0 = one per physical core
+    ONNX_GRAPH_OPTIMIZATION: str = "all"  # disable, basic, extended or all
+    MODEL_REGISTRY_DIR: str = "models/versions"  # Extra model versions, one {version}.pkl/.joblib/.onnx file each
+    MODEL_MEMORY_BUDGET_BYTES: int = 0  # Unload least recently used inactive versions above this; 0 = unlimited
+    MODEL_CANARY_VERSION: Optional[str] = None  # Candidate version served to a share of /predict traffic
+    MODEL_CANARY_PERCENT: float = 0.0  # Share of requests (0-100) without a model_version routed to the canary
+    MODEL_SHADOW_VERSION: Optional[str] = None  # Candidate version evaluated off the request path
+    MODEL_SHADOW_SAMPLE_RATE: float = 1.0  # Fraction of predictions that get a shadow run
+    MODEL_SHADOW_MAX_PENDING: int = 64  # Skip shadow runs beyond this many in flight
+    MODEL_SHADOW_MAX_WORKERS: int = 1  # Inference workers for shadow runs, separate from the primary pool
+
+    # Image preprocessing
+    IMAGE_TARGET_SHAPE: List[int] = [64, 128, 128]  # (depth, height, width)
+    PREPROCESS_CACHE_DIR: str = "cache/tensors"
+    PREPROCESS_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB, least recently used evicted first
+
+    # Inference execution
+    INFERENCE_EXECUTOR: str = "thread"  # "thread", "process" or "inline"
+    INFERENCE_MAX_WORKERS: int = 4
+    INFERENCE_MAX_QUEUE: int = 32  # Jobs allowed to wait for a free worker
+    INFERENCE_BATCH_MAX_SIZE: int = 32  # 1 disables micro-batching
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # Prediction result cache
+    RESULT_CACHE_MAX_ENTRIES: int = 10000  # 0 disables the cache
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Read-through cache of GET /results/{id} and /results/patient/{patient_id} responses
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000  # 0 disables the cache
+    RESPONSE_CACHE_HISTORY_TTL_SECONDS: float = 5.0  # Bounds staleness of history written by other workers
+
+    # Async prediction jobs (POST /predict?async_mode=true)
+    PREDICTION_QUEUE_ENABLED: bool = True  # Run the pending-job scheduler in this worker
+    PREDICTION_QUEUE_POLL_INTERVAL: float = 1.0  # Seconds between scans for pending rows
+    PREDICTION_QUEUE_CLAIM_SIZE: int = 32  # Pending rows claimed per scan
+    PREDICTION_QUEUE_CLAIM_TIMEOUT: float = 300.0  # Reclaim queued predictions left PROCESSING this long (crashed worker)
+    PREDICTION_LONG_POLL_TIMEOUT: float = 30.0  # Upper bound for /results/{id}/wait
+    PREDICTION_EVENTS_TIMEOUT: float = 600.0  # Longest /results/{id}/events stream
+    PREDICTION_WAIT_RECHECK_SECONDS: float = 15.0  # Database re-check while waiting (catches other workers); SSE keep-alive
+    PREDICTION_BATCH_MAX_ITEMS: int = 50000  # Requests accepted by one POST /predict/batch
+
+    # Result export (GET /results/export)
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched from the database cursor per chunk
+
+    # Metrics (GET /metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_LATENCY_BUCKETS: List[float] = [
+        0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+    ]
+
+    # Request profiling (opt-in; see app/core/profiling.py)
+    PROFILING_ENABLED: bool = False  # Honour the profiling header/sample rate and serve /admin/profiles
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled without the header
+    PROFILING_HEADER: str = "X-Profile"  # Request header selecting a profile ("cprofile" or "stack")
+    PROFILING_DEFAULT_MODE: str = "stack"
+    PROFILING_STACK_INTERVAL_MS: float = 5.0  # Stack sampling period
+    PROFILING_TOP_FUNCTIONS: int = 40  # Functions listed in a cProfile report
+    PROFILING_MAX_PROFILES: int = 50  # Most recent profiles kept in memory
 
     # MLOps
     MLFLOW_TRACKING_URI: str = "http://localhost:5000"
@@ -0,0 +1,187 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge:
+    """
+    Gauge whose value is read from a callback at scrape time
+
+    Reading live state (executor slots, batcher queue) avoids keeping a
+    second copy of it in sync.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Optional[float]]):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            # A broken gauge must not take down the whole scrape
+            return
+        if value is not None:
+            yield f"{self.name} {_format_value(float(value))}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = sorted(buckets) + [float("inf")]
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., sum, count
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        for labels, values in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(values[-2])}"
+            yield f"{self.name}_count{label_text} {values[-1]}"
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format
+
+    Nothing is pushed anywhere: ``/metrics`` renders the current values on
+    each scrape. Counters and histograms are per worker process.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float], enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+        self.http_requests = self.register(Counter(
+            "http_requests_total", "HTTP requests by route template, method and status",
+            ("method", "route", "status"),
+        ))
+        self.http_latency = self.register(Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route template",
+            ("method", "route"), latency_buckets,
+        ))
+        self.http_in_flight = 0
+        self.register(Gauge(
+            "http_requests_in_flight", "HTTP requests currently being served", lambda: self.http_in_flight,
+        ))
+        self.stage_latency = self.register(Histogram(
+            "stage_duration_seconds",
+            "Time spent in each hot-path stage (inference, preprocess, db_commit, upload_write, ...)",
+            ("stage",), latency_buckets,
+        ))
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], Optional[float]]):
+        """Register (or replace) a callback gauge"""
+        with self._lock:
+            self._metrics[name] = Gauge(name, documentation, callback)
+
+    def observe_stage(self, stage: str, seconds: float):
+        if self.enabled:
+            self.stage_latency.observe(seconds, stage)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Record the duration of the enclosed block as ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+metrics = MetricsRegistry(settings.METRICS_LATENCY_BUCKETS, enabled=settings.METRICS_ENABLED)
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get process metrics registry"""
+    return metrics
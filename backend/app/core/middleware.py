@@ -0,0 +1,85 @@
+import time
+from app.core.metrics import MetricsRegistry
+from app.core.profiling import RequestProfiler
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency and in-flight count
+
+    Requests are labelled with the matched route template (e.g.
+    ``/api/v1/results/{prediction_id}``), not the raw path, so ids do not
+    create new series; unmatched paths share the ``unmatched`` label. The
+    latency covers the full response, including streamed bodies.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.http_in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.http_in_flight -= 1
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            self.registry.http_latency.observe(time.perf_counter() - start, method, route_path)
+            self.registry.http_requests.inc(method, route_path, str(status_code))
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles opted-in requests
+
+    Profiled responses carry an ``X-Profile-Id`` header; the report is
+    served by ``/api/v1/admin/profiles/{id}``. The id is assigned before
+    the response starts, so streamed responses carry it too.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if not self.profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self.profiler.requested_mode(scope["headers"])
+        capture = self.profiler.start(mode) if mode else None
+        if capture is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(capture.id).encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.profiler.finish(capture, scope["method"], scope["path"], status_code, time.perf_counter() - start)
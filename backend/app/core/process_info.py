@@ -0,0 +1,40 @@
+import os
+import sys
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def get_process_memory() -> Dict[str, Optional[int]]:
+    """
+    Resident memory of the current worker process, in bytes
+
+    On Linux, ``rss_file_bytes`` counts file-backed pages such as
+    memory-mapped model weights, which are shared with other workers
+    through the page cache; ``rss_anon_bytes`` is private heap memory.
+    Elsewhere only the peak RSS is available, and on Windows nothing is.
+    """
+    memory = {
+        "pid": os.getpid(),
+        "rss_bytes": None,
+        "rss_anon_bytes": None,
+        "rss_file_bytes": None,
+    }
+
+    try:
+        with open("/proc/self/status") as status_file:
+            fields = dict(line.split(":", 1) for line in status_file if ":" in line)
+        for key, field in (("rss_bytes", "VmRSS"), ("rss_anon_bytes", "RssAnon"), ("rss_file_bytes", "RssFile")):
+            if field in fields:
+                memory[key] = int(fields[field].split()[0]) * 1024
+    except OSError:
+        if resource is None:
+            return memory
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        memory["rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+
+    return memory
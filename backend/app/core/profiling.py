@@ -0,0 +1,185 @@
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "stack")
+
+# Leaf frames of threads that are parked rather than working
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", os.path.join("futures", "thread.py"))
+
+
+class StackSampler(threading.Thread):
+    """
+    Wall-clock sampler of every thread's Python stack
+
+    Every ``interval`` seconds the stacks of all other threads are read
+    with ``sys._current_frames()`` and counted in folded form
+    (``thread;outer;...;inner``), ready for flamegraph tools. Threads parked
+    in a wait/select are skipped, so idle pool workers do not dominate.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> str:
+        self._stop_event.set()
+        self.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class ProfileCapture:
+    """One in-progress profile; ``finish`` returns the text report"""
+
+    def __init__(self, profile_id: int, mode: str):
+        self.id = profile_id
+        self.mode = mode
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(settings.PROFILING_STACK_INTERVAL_MS / 1000)
+            self._sampler.start()
+
+    def finish(self) -> str:
+        if self.mode == "stack":
+            return self._sampler.stop()
+
+        self._profile.disable()
+        output = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=output)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILING_TOP_FUNCTIONS)
+        return output.getvalue()
+
+
+class RequestProfiler:
+    """
+    Opt-in per-request profiling with an in-memory store of recent profiles
+
+    A request is profiled when PROFILING_ENABLED is set and either it sends
+    the PROFILING_HEADER (value ``cprofile`` or ``stack``, anything else
+    means the default mode) or it is picked by PROFILING_SAMPLE_RATE.
+
+    - ``cprofile``: deterministic profile of the event loop thread, which
+      runs the endpoint's coroutine (and any others interleaved with it)
+    - ``stack``: wall-clock stack samples of all threads, which includes
+      inference and database work in the pools
+
+    Only one request is profiled at a time; others run unprofiled. When
+    disabled, the only per-request cost is one attribute check.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 0.0,
+        header: str = "X-Profile",
+        default_mode: str = "stack",
+        max_profiles: int = 50,
+    ):
+        if default_mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode '{default_mode}'. Expected one of: {', '.join(PROFILE_MODES)}")
+
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.default_mode = default_mode
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max(1, max_profiles))
+        self._ids = itertools.count(1)
+        self._active = threading.Lock()
+
+    def requested_mode(self, headers: List) -> Optional[str]:
+        """Profiling mode for a request's raw ASGI headers, or None to skip it"""
+        for name, value in headers:
+            if name == self.header:
+                mode = value.decode("latin-1").strip().lower()
+                return mode if mode in PROFILE_MODES else self.default_mode
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self.default_mode
+        return None
+
+    def start(self, mode: str) -> Optional[ProfileCapture]:
+        """Begin a capture, or return None if another request is being profiled"""
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            return ProfileCapture(next(self._ids), mode)
+        except Exception:
+            self._active.release()
+            raise
+
+    def finish(self, capture: ProfileCapture, method: str, path: str, status: int, duration: float):
+        """Stop a capture and store its report under ``capture.id``"""
+        try:
+            report = capture.finish()
+        finally:
+            self._active.release()
+
+        self._profiles.append({
+            "id": capture.id,
+            "mode": capture.mode,
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(duration * 1000, 2),
+            "captured_at": datetime.utcnow().isoformat(),
+            "report": report,
+        })
+        logger.info(f"Stored {capture.mode} profile {capture.id} for {method} {path} ({duration * 1000:.1f}ms)")
+
+    def recent(self) -> List[Dict[str, Any]]:
+        return [{key: value for key, value in profile.items() if key != "report"} for profile in reversed(self._profiles)]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        for profile in self._profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+
+    def clear(self):
+        self._profiles.clear()
+
+
+# Singleton instance
+request_profiler = RequestProfiler(
+    enabled=settings.PROFILING_ENABLED,
+    sample_rate=settings.PROFILING_SAMPLE_RATE,
+    header=settings.PROFILING_HEADER,
+    default_mode=settings.PROFILING_DEFAULT_MODE,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+)
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get request profiler instance"""
+    return request_profiler
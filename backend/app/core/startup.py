@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from app.core.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def process_age() -> Optional[float]:
+    """Seconds since this process was started (Linux only), None elsewhere"""
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # Field 22, after the parenthesized command name, is the start time in clock ticks since boot
+            started = int(stat_file.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as uptime_file:
+            uptime = float(uptime_file.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - started)
+
+
+class StartupTimer:
+    """
+    Durations of the phases of worker startup
+
+    Started when this module is first imported (app.main imports it before
+    anything else), so the ``imports`` phase covers loading the app's
+    modules. ``ready`` is the time at which the worker started accepting
+    requests and ``warm`` the time at which the model was loaded and warmed
+    up, both in seconds since the timer started; the process age at
+    readiness also counts interpreter and server startup.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+        self.process_ready_seconds: Optional[float] = None
+        self.warm_seconds: Optional[float] = None
+        self.warmup_state = "pending"  # pending, running, done, failed or skipped
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = round(seconds, 4)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase ``name``"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def mark_ready(self):
+        self.ready_seconds = round(self.elapsed(), 4)
+        age = process_age()
+        self.process_ready_seconds = round(age, 2) if age is not None else None
+        logger.info(
+            f"Accepting requests {self.ready_seconds:.3f}s after import"
+            + (f" ({self.process_ready_seconds:.2f}s after process start)" if age is not None else "")
+            + f"; phases: {self.phases}"
+        )
+
+    def mark_warm(self, state: str = "done"):
+        self.warmup_state = state
+        if state == "done":
+            self.warm_seconds = round(self.elapsed(), 4)
+            logger.info(f"Model warm {self.warm_seconds:.3f}s after import; phases: {self.phases}")
+
+    @property
+    def is_warm(self) -> bool:
+        return self.warmup_state in ("done", "skipped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "phases": dict(self.phases),
+            "ready_seconds": self.ready_seconds,
+            "process_ready_seconds": self.process_ready_seconds,
+            "warm_seconds": self.warm_seconds,
+            "warmup": self.warmup_state,
+        }
+
+
+# Singleton instance
+startup_timer = StartupTimer()
+
+
+def get_startup_timer() -> StartupTimer:
+    """Get startup timer instance"""
+    return startup_timer
+
+
+get_metrics().gauge("startup_ready_seconds", "Seconds from app import until the worker accepted requests",
+                    lambda: get_startup_timer().ready_seconds)
+get_metrics().gauge("startup_warm_seconds", "Seconds from app import until the model was loaded and warmed up",
+                    lambda: get_startup_timer().warm_seconds)
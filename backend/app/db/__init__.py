@@ -1,3 +1,33 @@
-from .database import Base, engine, get_db, SessionLocal
+from .database import (
+    Base,
+    engine,
+    async_engine,
+    get_db,
+    get_read_db,
+    read_session,
+    fetch_first,
+    fetch_rows,
+    SessionLocal,
+    AsyncSessionLocal,
+    commit_with_retry,
+    create_tables,
+    check_schema,
+    get_pool_stats,
+)
 
-__all__ = ["Base", "engine", "get_db", "SessionLocal"]
+__all__ = [
+    "Base",
+    "engine",
+    "async_engine",
+    "get_db",
+    "get_read_db",
+    "read_session",
+    "fetch_first",
+    "fetch_rows",
+    "SessionLocal",
+    "AsyncSessionLocal",
+    "commit_with_retry",
+    "create_tables",
+    "check_schema",
+    "get_pool_stats",
+]
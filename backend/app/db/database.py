@@ -1,15 +1,193 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql import Select
 from app.core.config import settings
+from app.core.metrics import Counter, Histogram, get_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+pool_checkout_wait = get_metrics().register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection",
+    buckets=settings.METRICS_LATENCY_BUCKETS,
+))
+commit_lock_retries = get_metrics().register(Counter(
+    "db_commit_lock_retries_total", "Commits retried because the database was locked",
+))
+commit_lock_failures = get_metrics().register(Counter(
+    "db_commit_lock_failures_total", "Commits that failed because the database stayed locked",
+))
+
+
+class DatabaseMetrics:
+    """Counters for connection pool waits and SQLite lock contention"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.lock_retries = 0
+        self.lock_failures = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait: float):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+        if get_metrics().enabled:
+            pool_checkout_wait.observe(wait)
+
+    def record_lock_retry(self):
+        with self._lock:
+            self.lock_retries += 1
+        commit_lock_retries.inc()
+
+    def record_lock_failure(self):
+        with self._lock:
+            self.lock_failures += 1
+        commit_lock_failures.inc()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": round(self.checkout_wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 3),
+            "lock_retries": self.lock_retries,
+            "lock_failures": self.lock_failures,
+        }
+
+
+db_metrics = DatabaseMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_metrics.record_checkout(time.perf_counter() - start)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """TimedQueuePool for the async engine"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_metrics.record_checkout(time.perf_counter() - start)
+
+
+# Async driver used for each database backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def _is_memory_database(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def async_database_url(database_url: str) -> Optional[URL]:
+    """DATABASE_URL with its async driver, or None when the backend has none"""
+    url = make_url(database_url)
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=drivername) if drivername else None
+
+
+def _engine_options(database_url: Union[str, URL], poolclass: type = TimedQueuePool) -> Dict[str, Any]:
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+
+    if _is_memory_database(url):
+        # In-memory databases live in a single connection; keep SQLAlchemy's default pool
+        return {"connect_args": {"check_same_thread": False}}
+
+    options = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if is_sqlite:
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the single writer; NORMAL sync is safe with WAL"""
+    cursor = dbapi_connection.cursor()
+    # Whether this connection's main database is a file (in-memory databases have no file and no WAL)
+    cursor.execute("PRAGMA database_list")
+    if any(row[1] == "main" and row[2] for row in cursor.fetchall()):
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
+
+def _create_async_engine() -> Optional[AsyncEngine]:
+    """
+    Async engine for the read endpoints, or None to serve them from the sync engine
+
+    Async reads need a file or server database (an in-memory SQLite database
+    is private to the sync engine's connection) and an installed async driver.
+    """
+    if not settings.DB_ASYNC_READS:
+        return None
+    url = make_url(settings.ASYNC_DATABASE_URL) if settings.ASYNC_DATABASE_URL else async_database_url(settings.DATABASE_URL)
+    if url is None or _is_memory_database(url):
+        logger.info("Async database reads disabled: no async driver for this database")
+        return None
+
+    options = _engine_options(url, poolclass=TimedAsyncQueuePool)
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    try:
+        async_engine = create_async_engine(url, **options)
+    except ImportError:
+        driver = url.get_driver_name()
+        logger.warning(f"Async database reads disabled: {url.drivername} requires {driver} (pip install {driver})")
+        return None
+
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_engine
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = _create_async_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False) if async_engine else None
+
 Base = declarative_base()
 
 
@@ -20,3 +198,169 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@asynccontextmanager
+async def read_session():
+    """
+    Session for read-only queries
+
+    An AsyncSession on the async engine when DB_ASYNC_READS is set, so
+    queries hold neither the event loop nor a threadpool slot, and a sync
+    Session otherwise. Query it through ``fetch_rows``/``fetch_first``,
+    which run sync queries in the threadpool; either way the event loop
+    never blocks on the database.
+    """
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    else:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+
+async def get_read_db():
+    """Dependency for read-only endpoints (see ``read_session``)"""
+    async with read_session() as db:
+        yield db
+
+
+ReadSession = Union[AsyncSession, Session]
+
+
+async def fetch_rows(db: ReadSession, statement: Select) -> List[Any]:
+    """All rows of a column ``statement``, without building ORM objects; sync sessions run the query in the threadpool"""
+    if isinstance(db, AsyncSession):
+        return list((await db.execute(statement)).all())
+    return await run_in_threadpool(lambda: list(db.execute(statement).all()))
+
+
+async def fetch_first(db: ReadSession, statement: Select) -> Optional[Any]:
+    """First entity selected by ``statement``, or None"""
+    if isinstance(db, AsyncSession):
+        return (await db.scalars(statement.limit(1))).first()
+    return await run_in_threadpool(lambda: db.scalars(statement.limit(1)).first())
+
+
+def create_tables():
+    """Create missing tables for every model (run at startup when DB_CREATE_TABLES is set)"""
+    import app.models  # noqa: F401  registers the models on Base.metadata
+
+    Base.metadata.create_all(bind=engine)
+
+
+def check_schema():
+    """
+    Fail loudly if an existing table lacks columns of its model
+
+    ``create_all`` only creates missing tables; columns added to a model
+    later need a migration (``alembic upgrade head``).
+    """
+    import app.models  # noqa: F401  registers the models on Base.metadata
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            problems.append(f"table {table.name} is missing")
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = [column.name for column in table.columns if column.name not in columns]
+        if missing:
+            problems.append(f"table {table.name} is missing columns {', '.join(missing)}")
+    if problems:
+        raise RuntimeError(f"Database schema is out of date ({'; '.join(problems)}); run `alembic upgrade head`")
+
+
+async def dispose_engines():
+    """Close pooled connections (on shutdown)"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+def _is_lock_error(error: OperationalError) -> bool:
+    message = str(error.orig).lower()
+    return "database is locked" in message or "deadlock" in message
+
+
+def commit_with_retry(db: Session, retries: Optional[int] = None, work: Optional[Callable[[], Any]] = None) -> Any:
+    """
+    Commit, retrying when the database reports lock contention
+
+    A failed commit rolls the session back, which discards pending inserts
+    and expires modified objects, so the pending changes are captured first
+    and re-applied before each retry. Statements executed directly (Core
+    inserts, bulk updates) are not tracked by the session: pass them as
+    ``work``, which runs in the transaction before every commit attempt.
+    Returns what ``work`` returned.
+    """
+    retries = settings.DB_LOCK_RETRIES if retries is None else retries
+
+    for attempt in range(retries + 1):
+        new_objects = list(db.new)
+        changes = [
+            (obj, {attr.key: attr.value for attr in inspect(obj).attrs if attr.history.has_changes()})
+            for obj in db.dirty
+        ]
+
+        try:
+            with get_metrics().time_stage("db_commit"):
+                result = work() if work is not None else None
+                db.commit()
+            return result
+        except OperationalError as e:
+            db.rollback()
+            if not _is_lock_error(e) or attempt == retries:
+                if _is_lock_error(e):
+                    db_metrics.record_lock_failure()
+                raise
+
+            db_metrics.record_lock_retry()
+            logger.warning(f"Database locked, retrying commit ({attempt + 1}/{retries})")
+            time.sleep(0.05 * 2 ** attempt)
+
+            for obj in new_objects:
+                db.add(obj)
+            for obj, values in changes:
+                for key, value in values.items():
+                    setattr(obj, key, value)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool occupancy plus checkout/lock metrics"""
+    stats = _pool_stats(engine.pool)
+    stats["async_reads"] = _pool_stats(async_engine.pool) if async_engine is not None else None
+    stats.update(db_metrics.stats())
+    return stats
+
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    return stats
+
+
+def _pool_value(pool, attribute: str) -> Optional[int]:
+    """Occupancy figure of a QueuePool (size, checkedout or overflow), None for other pools"""
+    return getattr(pool, attribute)() if isinstance(pool, QueuePool) else None
+
+
+get_metrics().gauge("db_pool_size", "Connections the database pool keeps open",
+                    lambda: _pool_value(engine.pool, "size"))
+get_metrics().gauge("db_pool_checked_out", "Database connections currently in use",
+                    lambda: _pool_value(engine.pool, "checkedout"))
+get_metrics().gauge("db_pool_overflow", "Database connections open beyond the pool size (negative while below it)",
+                    lambda: _pool_value(engine.pool, "overflow"))
+if async_engine is not None:
+    get_metrics().gauge("db_async_pool_checked_out", "Async read connections currently in use",
+                        lambda: _pool_value(async_engine.pool, "checkedout"))
@@ -1,12 +1,19 @@
+from app.core.startup import get_startup_timer  # First, so the imports phase covers the modules below
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import logging
 
 from app.core.config import settings
+from app.core.metrics import get_metrics
+from app.core.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.core.profiling import get_request_profiler
 from app.api.v1.api import api_router
-from app.db.database import engine, Base
-from app.models import Patient, Prediction
+from app.db.database import check_schema, create_tables, dispose_engines
+from app.models import Patient, Prediction, UploadBlob
+from app.services import get_ml_service, get_inference_executor, get_model_rollout, get_prediction_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -15,10 +22,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-logger.info("Database tables created")
-
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -26,6 +29,7 @@ app = FastAPI(
     description="FastAPI backend for Alzheimer's Disease Detection Platform",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -37,11 +41,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and in-flight request metrics
+app.add_middleware(MetricsMiddleware, registry=get_metrics())
+
+# Opt-in request profiling (PROFILING_ENABLED)
+app.add_middleware(ProfilingMiddleware, profiler=get_request_profiler())
+
+
+async def warm_up():
+    """Load and warm up the active model and preload rollout candidates, timing each phase"""
+    timer = get_startup_timer()
+    timer.warmup_state = "running"
+    try:
+        with timer.phase("model_load"):
+            ml_service = await run_in_threadpool(get_ml_service)
+        if settings.MODEL_WARMUP:
+            with timer.phase("model_warmup"):
+                await run_in_threadpool(ml_service.warmup)
+        with timer.phase("rollout_preload"):
+            await run_in_threadpool(get_model_rollout().preload)
+    except Exception:
+        timer.mark_warm("failed")
+        raise
+    timer.mark_warm()
+
+
+async def background_warm_up():
+    """``warm_up`` off the startup path; requests that need the model before it finishes load it themselves"""
+    try:
+        await warm_up()
+    except Exception as e:
+        logger.error(f"Background model warmup failed: {str(e)}")
+
 
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    timer = get_startup_timer()
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
+    if settings.DB_CREATE_TABLES:
+        with timer.phase("create_tables"):
+            await run_in_threadpool(create_tables)
+        logger.info("Database tables created")
+    with timer.phase("check_schema"):
+        await run_in_threadpool(check_schema)
+    app.state.warmup_task = None
+    if not settings.MODEL_EAGER_LOAD:
+        timer.mark_warm("skipped")
+    elif settings.MODEL_BACKGROUND_WARMUP:
+        app.state.warmup_task = asyncio.create_task(background_warm_up())
+    else:
+        await warm_up()
+    if settings.PREDICTION_QUEUE_ENABLED:
+        with timer.phase("scheduler_start"):
+            get_prediction_scheduler().start()
+    timer.mark_ready()
     logger.info("Application startup complete")
 
 
@@ -49,6 +103,13 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown"""
     logger.info("Shutting down application")
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await get_prediction_scheduler().stop()
+    await get_model_rollout().stop()
+    get_inference_executor().shutdown(wait=False)
+    await dispose_engines()
 
 
 @app.get("/")
@@ -68,6 +129,12 @@ async def ping():
     return {"status": "ok", "message": "pong"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4")
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -76,11 +143,13 @@ app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
+get_startup_timer().record("imports", get_startup_timer().elapsed())
+
 
 if __name__ == "__main__":
     import uvicorn
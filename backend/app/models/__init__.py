@@ -1,4 +1,5 @@
 from .patient import Patient
 from .prediction import Prediction
+from .upload import UploadBlob
 
-__all__ = ["Patient", "Prediction"]
+__all__ = ["Patient", "Prediction", "UploadBlob"]
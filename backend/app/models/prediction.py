@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Keyset pagination: newest first, id breaks created_at ties
+        Index("ix_predictions_created_at_id", "created_at", "id"),
+        Index("ix_predictions_patient_id_created_at_id", "patient_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(String(100), index=True, nullable=False)
+    patient_id = Column(String(100), nullable=False)
     status = Column(String(20), default="pending", nullable=False)
 
     # Results
@@ -18,9 +23,11 @@ class Prediction(Base):
     model_version = Column(String(50), nullable=True)
 
     # Additional data
+    input_data = Column(JSON(none_as_null=True), nullable=True)  # Request payload for queued (async) predictions
     result_data = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
     image_path = Column(String(500), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # When the scheduler last claimed a queued prediction
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class UploadBlob(Base):
+    __tablename__ = "upload_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 hex digest
+    filename = Column(String(255), unique=True, nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, default=1, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,3 +1,4 @@
+from .model import ModelRolloutConfig
 from .patient import PatientBase, PatientCreate, PatientResponse, Gender
 from .prediction import (
     PredictionRequest,
@@ -9,6 +10,7 @@ from .prediction import (
 )
 
 __all__ = [
+    "ModelRolloutConfig",
     "PatientBase",
     "PatientCreate",
     "PatientResponse",
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class ModelRolloutConfig(BaseModel):
+    canary_version: Optional[str] = Field(None, description="Candidate version served to a share of requests")
+    canary_percent: float = Field(0.0, ge=0.0, le=100.0, description="Percentage of requests routed to the canary")
+    shadow_version: Optional[str] = Field(None, description="Candidate version evaluated off the request path")
+    shadow_sample_rate: float = Field(1.0, ge=0.0, le=1.0, description="Fraction of predictions shadow-evaluated")
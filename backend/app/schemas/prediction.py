@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
 
@@ -18,14 +18,20 @@ class RiskLevel(str, Enum):
 
 
 class PredictionRequest(BaseModel):
+    # Allow the model_version field (pydantic reserves the model_ prefix)
+    model_config = ConfigDict(protected_namespaces=())
+
     patient_id: str = Field(..., description="Patient identifier")
     age: int = Field(..., ge=0, le=150)
     gender: str
     clinical_notes: Optional[str] = None
     image_path: Optional[str] = Field(None, description="Path to uploaded medical image")
+    model_version: Optional[str] = Field(None, description="Model version to use; defaults to the active model")
 
 
 class PredictionResult(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
     has_alzheimer: bool = Field(..., description="Whether Alzheimer's is detected")
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Prediction confidence (0-1)")
     risk_level: RiskLevel = Field(..., description="Risk assessment level")
@@ -45,6 +51,38 @@ class PredictionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @model_validator(mode="before")
+    @classmethod
+    def _from_row(cls, data: Any) -> Any:
+        """
+        Build the response from a flat prediction row (ORM object or selected
+        columns), nesting the result columns of completed predictions
+        """
+        if isinstance(data, dict):
+            return data
+        values = {field: getattr(data, field) for field in RESPONSE_ROW_FIELDS}
+        if values["status"] == PredictionStatus.COMPLETED.value:
+            values["result"] = {field: getattr(data, field) for field in RESULT_ROW_FIELDS}
+        return values
+
+
+# Prediction row attributes read by PredictionResponse._from_row
+RESPONSE_ROW_FIELDS = ("id", "patient_id", "status", "error_message", "created_at", "completed_at")
+RESULT_ROW_FIELDS = tuple(PredictionResult.model_fields)
+
+
+class PredictionBatchItem(BaseModel):
+    index: int = Field(..., description="Position of the request in the batch")
+    prediction: PredictionResponse
+    error: Optional[str] = None
+
+
+class PredictionBatchResponse(BaseModel):
+    total: int
+    completed: int
+    failed: int
+    items: List[PredictionBatchItem]
+
 
 class PredictionCreate(BaseModel):
     patient_id: str
@@ -1,3 +1,65 @@
-from .ml_service import get_ml_service, MLModelService
+"""
+Service layer
 
-__all__ = ["get_ml_service", "MLModelService"]
+Exports are resolved on first access (module ``__getattr__``), so importing
+one service does not import the others and their dependencies.
+"""
+import importlib
+from typing import Any
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "default_feature_pipeline": "features",
+    "FeaturePipeline": "features",
+    "get_ml_service": "ml_service",
+    "run_prediction_batch": "ml_service",
+    "save_model_artifact": "ml_service",
+    "MLModelService": "ml_service",
+    "get_model_registry": "model_registry",
+    "ModelRegistry": "model_registry",
+    "get_inference_executor": "inference_executor",
+    "InferenceExecutor": "inference_executor",
+    "InferenceQueueFull": "inference_executor",
+    "get_prediction_batcher": "batching",
+    "MicroBatcher": "batching",
+    "get_prediction_scheduler": "prediction_jobs",
+    "apply_prediction_result": "prediction_jobs",
+    "mark_prediction_failed": "prediction_jobs",
+    "PredictionScheduler": "prediction_jobs",
+    "get_prediction_notifier": "notifications",
+    "PredictionNotifier": "notifications",
+    "get_model_rollout": "rollout",
+    "ModelRollout": "rollout",
+    "get_image_preprocessor": "preprocessing",
+    "ImagePreprocessor": "preprocessing",
+    "TensorCache": "preprocessing",
+    "get_result_cache": "result_cache",
+    "prediction_cache_key": "result_cache",
+    "ResultCache": "result_cache",
+    "get_response_cache": "response_cache",
+    "etag_matches": "response_cache",
+    "CachedResponse": "response_cache",
+    "ResponseCache": "response_cache",
+    "get_upload_session_store": "upload_storage",
+    "release_blob": "upload_storage",
+    "save_stream": "upload_storage",
+    "save_upload_file": "upload_storage",
+    "store_blob": "upload_storage",
+    "UploadSessionStore": "upload_storage",
+    "UploadSessionError": "upload_storage",
+    "UploadTooLarge": "upload_storage",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import get_metrics
+from app.services.inference_executor import InferenceExecutor, get_inference_executor
+from app.services.ml_service import run_prediction_batch
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching for concurrent inference requests
+
+    Concurrent ``submit`` calls are collected until either ``max_batch_size``
+    items are waiting or ``max_wait_ms`` has passed since the first one
+    arrived. The batch then runs as a single ``batch_fn(patient_records,
+    image_paths, model_version)`` call on the inference executor and each
+    caller receives its own result (or its own exception, for items the
+    batch function returned as exceptions). Items for different model
+    versions never share a batch. One batch occupies one slot of
+    ``executor`` (the shared inference executor by default), so the
+    executor's queue bound still applies.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Dict[str, Any]], List[Optional[str]], Optional[str]], List[Dict[str, Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[InferenceExecutor] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Dict[str, Any], Optional[str], Optional[str], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(
+        self,
+        patient_data: Dict[str, Any],
+        image_path: Optional[str] = None,
+        model_version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Queue one prediction and wait for the batch that carries it"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending state belongs to the loop that created it
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future = loop.create_future()
+        self._pending.append((patient_data, image_path, model_version, future))
+
+        if len(self._pending) >= self.max_batch_size or self.max_wait == 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        by_version: Dict[Optional[str], list] = {}
+        for item in self._pending:
+            by_version.setdefault(item[2], []).append(item)
+        self._pending = []
+
+        for model_version, items in by_version.items():
+            for start in range(0, len(items), self.max_batch_size):
+                batch = items[start:start + self.max_batch_size]
+                task = self._loop.create_task(self._run_batch(batch, model_version))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], Optional[str], Optional[str], asyncio.Future]],
+        model_version: Optional[str]
+    ):
+        records = [item[0] for item in batch]
+        image_paths = [item[1] for item in batch]
+
+        try:
+            executor = self.executor or get_inference_executor()
+            results = await executor.run(self.batch_fn, records, image_paths, model_version)
+        except Exception as e:
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Ran inference batch of {len(batch)} (model {model_version or 'active'})")
+        for (_, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# Singleton instance
+prediction_batcher = MicroBatcher(
+    run_prediction_batch,
+    max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+    max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS,
+)
+
+
+def get_prediction_batcher() -> MicroBatcher:
+    """Get prediction micro-batcher instance"""
+    return prediction_batcher
+
+
+get_metrics().gauge("batcher_pending", "Predictions waiting for the next micro-batch",
+                    lambda: get_prediction_batcher().pending)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+from app.core.metrics import get_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference executor cannot accept another job"""
+
+
+def _timed_job(job: Callable[[], Any], submitted_at: float) -> Any:
+    """Record how long a job waited for a pool thread, then run it"""
+    get_metrics().observe_stage("inference_queue_wait", time.perf_counter() - submitted_at)
+    return job()
+
+
+class InferenceExecutor:
+    """
+    Bounded executor for running blocking inference off the event loop
+
+    - "thread": thread pool, for models that release the GIL (NumPy, sklearn)
+    - "process": process pool, for pure-Python models
+    - "inline": run on the calling thread (legacy behaviour, for benchmarking)
+
+    At most ``max_workers + max_queue`` jobs are accepted at once. Further
+    submissions fail fast with InferenceQueueFull so callers can shed load
+    instead of piling up requests behind a saturated model.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 32):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown inference executor '{kind}'. Expected one of: {', '.join(EXECUTOR_KINDS)}")
+
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Accepted jobs still waiting for a free worker"""
+        return max(0, self._in_flight - self.max_workers)
+
+    @property
+    def is_saturated(self) -> bool:
+        return self._in_flight >= self.capacity
+
+    def _get_executor(self) -> Executor:
+        """Create the underlying pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="inference",
+                    )
+                logger.info(f"Started {self.kind} inference pool with {self.max_workers} workers")
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise InferenceQueueFull(
+                    f"Inference queue is full ({self._in_flight}/{self.capacity} jobs)"
+                )
+            self._in_flight += 1
+
+    def _release(self, *_):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` on the pool and await its result
+
+        For the process pool, ``func`` and its arguments must be picklable.
+        The slot is released when the job actually finishes, so a cancelled
+        request does not free capacity while its inference is still running.
+        """
+        self._acquire()
+
+        if self.kind == "inline":
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._release()
+
+        job = partial(func, *args, **kwargs)
+        if self.kind == "thread":
+            job = partial(_timed_job, job, time.perf_counter())
+
+        try:
+            future = self._get_executor().submit(job)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "capacity": self.capacity,
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+# Singleton instance
+inference_executor = InferenceExecutor(
+    kind=settings.INFERENCE_EXECUTOR,
+    max_workers=settings.INFERENCE_MAX_WORKERS,
+    max_queue=settings.INFERENCE_MAX_QUEUE,
+)
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get inference executor instance"""
+    return inference_executor
+
+
+get_metrics().gauge("inference_in_flight", "Inference jobs running or waiting for a worker",
+                    lambda: get_inference_executor().in_flight)
+get_metrics().gauge("inference_queue_depth", "Inference jobs waiting for a free worker",
+                    lambda: get_inference_executor().queue_depth)
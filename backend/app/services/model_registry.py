@@ -0,0 +1,260 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.metrics import get_metrics
+from app.services.ml_service import MLModelService
+import logging
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE_EXTENSIONS = (".pkl", ".joblib", ".onnx")
+
+
+class ModelRegistry:
+    """
+    Registry of model versions, several of which can be loaded at once
+
+    The default version (MODEL_VERSION at MODEL_PATH) is always registered
+    and active at start; ``{version}.pkl`` / ``.joblib`` / ``.onnx`` files in
+    MODEL_REGISTRY_DIR add further versions. Requests may name a version,
+    otherwise the active one serves them.
+
+    Loading (or reloading) a version builds and warms a fresh
+    MLModelService off to the side and then replaces the registry entry in
+    one step. Requests already running keep the instance they started
+    with, so a swap never interrupts them. When the estimated heap memory
+    of loaded versions exceeds MODEL_MEMORY_BUDGET_BYTES, the least
+    recently used versions that are not pinned (the active version, and
+    any version pinned for rollouts) are unloaded.
+    """
+
+    def __init__(self, default_version: str, default_path: str, registry_dir: str, memory_budget: int = 0):
+        self.registry_dir = Path(registry_dir)
+        self.memory_budget = memory_budget
+        self.active_version = default_version
+        self._paths: Dict[str, str] = {default_version: default_path}
+        self._services: Dict[str, MLModelService] = {}
+        self._memory: Dict[str, Dict[str, int]] = {}
+        self._last_used: Dict[str, float] = {}
+        self._pinned: set = set()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def discover(self) -> List[str]:
+        """Register every model file in MODEL_REGISTRY_DIR; returns all known versions"""
+        if self.registry_dir.is_dir():
+            for path in sorted(self.registry_dir.iterdir()):
+                if path.suffix in MODEL_FILE_EXTENSIONS and path.is_file():
+                    with self._lock:
+                        self._paths.setdefault(path.stem, str(path))
+        return self.versions()
+
+    def register(self, version: str, model_path: str):
+        with self._lock:
+            self._paths[version] = model_path
+
+    def versions(self) -> List[str]:
+        with self._lock:
+            return sorted(self._paths)
+
+    def resolve(self, version: Optional[str] = None) -> str:
+        """
+        Concrete version a request for ``version`` is served by
+
+        Resolving in the API process pins queued and process-pool work to
+        the version that was active when the request arrived. Raises
+        KeyError for unknown versions.
+        """
+        version = version or self.active_version
+        if version not in self._paths:
+            self.discover()
+            if version not in self._paths:
+                raise KeyError(version)
+        return version
+
+    def get(self, version: Optional[str] = None) -> MLModelService:
+        """
+        Loaded service for ``version`` (the active version by default)
+
+        Loads the version on first use. Raises KeyError for unknown versions.
+        """
+        version = version or self.active_version
+        service = self._services.get(version)
+        if service is None:
+            service = self._load_once(self.resolve(version))
+        self._last_used[version] = time.monotonic()
+        return service
+
+    def peek(self, version: Optional[str] = None) -> Optional[MLModelService]:
+        """Loaded service for ``version`` without loading or touching it"""
+        return self._services.get(version or self.active_version)
+
+    def _load_lock(self, version: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(version, threading.Lock())
+
+    def _load_once(self, version: str) -> MLModelService:
+        with self._load_lock(version):
+            service = self._services.get(version)
+            if service is None:
+                service = self.load(version, warmup=False, allow_placeholder=True)
+            return service
+
+    def load(self, version: str, warmup: bool = True, allow_placeholder: bool = False) -> MLModelService:
+        """
+        Load (or reload) ``version`` and swap it in
+
+        The new instance only replaces the registered one after it has
+        loaded and warmed up; until then the previous instance keeps serving.
+        Raises ValueError, keeping the previous instance, when the model
+        file is missing or cannot be loaded, unless ``allow_placeholder``
+        (used on first use) lets placeholder predictions stand in for it.
+        """
+        model_path = self._paths[self.resolve(version)]
+
+        service = MLModelService(model_version=version, model_path=model_path)
+        service.load_model()
+        if not service.is_loaded and not allow_placeholder:
+            raise ValueError(f"Model {version} failed to load: {service.load_error}")
+        if warmup:
+            service.warmup()
+        memory = service.memory()
+
+        with self._lock:
+            previous = self._services.get(version)
+            self._services[version] = service
+            self._memory[version] = memory
+            self._last_used[version] = time.monotonic()
+
+        logger.info(
+            f"{'Reloaded' if previous else 'Loaded'} model {version} "
+            f"({memory['heap_bytes']} heap bytes, {memory['mapped_bytes']} mapped bytes)"
+        )
+        self._enforce_budget()
+        return service
+
+    def activate(self, version: str) -> MLModelService:
+        """
+        Make ``version`` the default for requests that do not name one
+
+        Raises ValueError when the version only serves placeholder
+        predictions because its model could not be loaded.
+        """
+        service = self.get(version)
+        if not service.is_loaded and version != self.active_version:
+            raise ValueError(f"Model {version} failed to load: {service.load_error}")
+        with self._lock:
+            previous, self.active_version = self.active_version, version
+        logger.info(f"Active model switched from {previous} to {version}")
+        return service
+
+    def unload(self, version: str) -> bool:
+        """Drop a loaded version; the active version cannot be unloaded"""
+        with self._lock:
+            if version == self.active_version:
+                raise ValueError(f"Model {version} is active and cannot be unloaded")
+            service = self._services.pop(version, None)
+            self._memory.pop(version, None)
+        if service is not None:
+            logger.info(f"Unloaded model {version}")
+        return service is not None
+
+    def pin(self, version: str):
+        """Protect a version from memory-budget eviction"""
+        with self._lock:
+            self._pinned.add(version)
+
+    def unpin(self, version: str):
+        with self._lock:
+            self._pinned.discard(version)
+
+    def _enforce_budget(self):
+        if not self.memory_budget:
+            return
+
+        with self._lock:
+            total = sum(memory["heap_bytes"] for memory in self._memory.values())
+            candidates = sorted(
+                (self._last_used.get(version, 0.0), version)
+                for version in self._services
+                if version != self.active_version and version not in self._pinned
+            )
+            evicted = []
+            for _, version in candidates:
+                if total <= self.memory_budget:
+                    break
+                total -= self._memory.pop(version, {}).get("heap_bytes", 0)
+                self._services.pop(version, None)
+                evicted.append(version)
+
+        for version in evicted:
+            logger.info(f"Evicted idle model {version} to stay within the memory budget")
+
+    def memory_bytes(self) -> int:
+        return sum(memory["heap_bytes"] for memory in self._memory.values())
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Status of every known version"""
+        now = time.monotonic()
+        with self._lock:
+            entries = []
+            for version, model_path in sorted(self._paths.items()):
+                service = self._services.get(version)
+                last_used = self._last_used.get(version)
+                entries.append({
+                    "version": version,
+                    "path": model_path,
+                    "active": version == self.active_version,
+                    "pinned": version in self._pinned,
+                    "status": (
+                        "not_loaded" if service is None
+                        else "loaded" if service.is_loaded
+                        else "placeholder"
+                    ),
+                    "memory": self._memory.get(version),
+                    "load_time_seconds": service.load_time if service else None,
+                    "warmup_time_seconds": service.warmup_time if service else None,
+                    "idle_seconds": round(now - last_used, 1) if last_used is not None and service else None,
+                })
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_version": self.active_version,
+            "loaded_versions": sorted(self._services),
+            "memory_bytes": self.memory_bytes(),
+            "memory_budget_bytes": self.memory_budget or None,
+        }
+
+
+# Singleton instance
+model_registry = ModelRegistry(
+    default_version=settings.MODEL_VERSION,
+    default_path=settings.MODEL_PATH,
+    registry_dir=settings.MODEL_REGISTRY_DIR,
+    memory_budget=settings.MODEL_MEMORY_BUDGET_BYTES,
+)
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get model registry instance"""
+    return model_registry
+
+
+def _active_service_value(attribute: str):
+    service = get_model_registry().peek()
+    return getattr(service, attribute) if service is not None else None
+
+
+get_metrics().gauge("model_load_seconds", "Time taken to load the active model",
+                    lambda: _active_service_value("load_time"))
+get_metrics().gauge("model_warmup_seconds", "Time taken by the active model's warmup inference",
+                    lambda: _active_service_value("warmup_time"))
+get_metrics().gauge("model_loaded", "1 if a real model is active, 0 for placeholder predictions",
+                    lambda: _active_service_value("is_loaded"))
+get_metrics().gauge("models_loaded", "Model versions currently loaded",
+                    lambda: len(get_model_registry().stats()["loaded_versions"]))
+get_metrics().gauge("models_memory_bytes", "Estimated heap memory of loaded model versions",
+                    lambda: get_model_registry().memory_bytes())
@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any, Dict, Optional, Set
+from app.core.metrics import get_metrics
+
+
+class PredictionSubscription:
+    """A waiter for changes of one prediction; use as a context manager"""
+
+    def __init__(self, notifier: "PredictionNotifier", prediction_id: int):
+        self.notifier = notifier
+        self.prediction_id = prediction_id
+        self._event = asyncio.Event()
+
+    def __enter__(self) -> "PredictionSubscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.notifier._unsubscribe(self)
+
+    def _notify(self):
+        self._event.set()
+
+    async def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait for the next change (or one published since the last wait)
+
+        Returns False when ``timeout`` passed without one.
+        """
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
+
+
+class PredictionNotifier:
+    """
+    In-process channel that tells waiters a prediction row changed
+
+    The inference path publishes a prediction id after committing a status
+    change (claimed, completed, failed, requeued), and long-poll and SSE
+    handlers wake up and re-read the row instead of polling the database.
+    Subscribe before reading the row, so a change committed in between
+    is not missed. Changes made by other worker processes are not
+    published here; waiters re-check the database on a long interval to
+    pick those up.
+
+    Used from the event loop only.
+    """
+
+    def __init__(self):
+        self.published = 0
+        self._subscriptions: Dict[int, Set[PredictionSubscription]] = {}
+
+    def subscribe(self, prediction_id: int) -> PredictionSubscription:
+        subscription = PredictionSubscription(self, prediction_id)
+        self._subscriptions.setdefault(prediction_id, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: PredictionSubscription):
+        subscriptions = self._subscriptions.get(subscription.prediction_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.prediction_id]
+
+    def publish(self, prediction_id: int):
+        """Wake everyone waiting on ``prediction_id``"""
+        self.published += 1
+        for subscription in self._subscriptions.get(prediction_id, ()):
+            subscription._notify()
+
+    @property
+    def waiters(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "waiters": self.waiters,
+            "predictions_watched": len(self._subscriptions),
+            "published": self.published,
+        }
+
+
+# Singleton instance
+prediction_notifier = PredictionNotifier()
+
+
+def get_prediction_notifier() -> PredictionNotifier:
+    """Get prediction change notifier instance"""
+    return prediction_notifier
+
+
+get_metrics().gauge("prediction_waiters", "Long-poll and SSE clients waiting on a prediction", lambda: get_prediction_notifier().waiters)
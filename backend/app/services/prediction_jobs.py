@@ -0,0 +1,279 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_
+from app.core.config import settings
+from app.db.database import SessionLocal, commit_with_retry
+from app.models.prediction import Prediction
+from app.schemas.prediction import PredictionStatus
+from app.services.batching import get_prediction_batcher
+from app.services.inference_executor import InferenceQueueFull
+from app.services.notifications import get_prediction_notifier
+from app.services.response_cache import get_response_cache
+from app.services.rollout import get_model_rollout
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def apply_prediction_result(prediction: Prediction, result: Dict[str, Any]) -> None:
+    """Copy a model result onto a prediction row and mark it completed"""
+    prediction.status = PredictionStatus.COMPLETED.value
+    prediction.has_alzheimer = int(result["has_alzheimer"])
+    prediction.confidence_score = result["confidence_score"]
+    prediction.risk_level = result["risk_level"]
+    prediction.processing_time = result["processing_time"]
+    prediction.model_version = result["model_version"]
+    prediction.result_data = result
+    prediction.completed_at = datetime.utcnow()
+
+
+def mark_prediction_failed(prediction: Prediction, error_message: str) -> None:
+    """Mark a prediction row as failed"""
+    prediction.status = PredictionStatus.FAILED.value
+    prediction.error_message = error_message
+
+
+class PredictionScheduler:
+    """
+    Background scheduler for queued predictions
+
+    The queue is the predictions table itself: async /predict calls insert a
+    PENDING row with the request payload in ``input_data``, and this
+    scheduler claims pending rows (PENDING -> PROCESSING with a conditional
+    UPDATE, so several workers can share the table), runs inference through
+    the micro-batcher and writes the result back.
+
+    Claims are stamped with ``claimed_at``. ``stop`` puts this worker's
+    unfinished claims back to PENDING; claims older than ``claim_timeout``
+    (left behind by a worker that crashed, or whose result could not be
+    written) are claimed again. Errors in one poll or one prediction are
+    logged and never stop the scheduler.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, claim_size: int = 32, claim_timeout: float = 300.0):
+        self.poll_interval = poll_interval
+        self.claim_size = max(1, claim_size)
+        self.claim_timeout = claim_timeout
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._claimed: Set[int] = set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the scheduler on the running event loop"""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Prediction scheduler started")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._claimed:
+            released = list(self._claimed)
+            self._claimed.clear()
+            try:
+                await run_in_threadpool(self._release, released)
+            except Exception as e:
+                logger.error(f"Failed to release claimed predictions {released}: {str(e)}")
+            for prediction_id in released:
+                get_prediction_notifier().publish(prediction_id)
+            logger.info(f"Returned {len(released)} unfinished predictions to the queue")
+        logger.info("Prediction scheduler stopped")
+
+    def notify(self):
+        """Wake the scheduler after a new pending row was committed"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                if await self._poll():
+                    continue
+            except Exception as e:
+                logger.error(f"Prediction scheduler poll failed: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self) -> bool:
+        """Claim and run one round of predictions; returns True to poll again right away"""
+        try:
+            claimed = await run_in_threadpool(self._claim_pending)
+        except Exception as e:
+            logger.error(f"Failed to claim pending predictions: {str(e)}")
+            return False
+
+        for prediction_id, _ in claimed:
+            self._claimed.add(prediction_id)
+            get_prediction_notifier().publish(prediction_id)
+
+        if not claimed:
+            return False
+        handled = await asyncio.gather(*(self._process(pid, data) for pid, data in claimed), return_exceptions=True)
+        for (prediction_id, _), outcome in zip(claimed, handled):
+            if isinstance(outcome, Exception):
+                logger.error(f"Queued prediction {prediction_id} failed unexpectedly: {str(outcome)}")
+        # False when the inference queue is saturated: back off before reclaiming
+        return all(outcome is True for outcome in handled)
+
+    def _claimable(self, now: datetime):
+        """Pending queued predictions, and queued predictions whose claim expired"""
+        expired = now - timedelta(seconds=self.claim_timeout)
+        return or_(
+            Prediction.status == PredictionStatus.PENDING.value,
+            and_(
+                Prediction.status == PredictionStatus.PROCESSING.value,
+                Prediction.input_data.isnot(None),
+                or_(Prediction.claimed_at.is_(None), Prediction.claimed_at < expired),
+            ),
+        )
+
+    def _claim_pending(self) -> List[Tuple[int, Dict[str, Any]]]:
+        now = datetime.utcnow()
+        db = SessionLocal()
+
+        def claim() -> List[Tuple[int, Dict[str, Any]]]:
+            candidates = (
+                db.query(Prediction.id, Prediction.input_data)
+                .filter(self._claimable(now))
+                .order_by(Prediction.id)
+                .limit(self.claim_size)
+                .all()
+            )
+
+            claimed = []
+            for prediction_id, input_data in candidates:
+                updated = (
+                    db.query(Prediction)
+                    .filter(Prediction.id == prediction_id, self._claimable(now))
+                    .update(
+                        {"status": PredictionStatus.PROCESSING.value, "claimed_at": now},
+                        synchronize_session=False,
+                    )
+                )
+                if updated:
+                    claimed.append((prediction_id, input_data or {}))
+            return claimed
+
+        try:
+            claimed = commit_with_retry(db, work=claim)
+            for _, input_data in claimed:
+                get_response_cache().invalidate_patient(input_data.get("patient_id"))
+            return claimed
+        finally:
+            db.close()
+
+    async def _process(self, prediction_id: int, input_data: Dict[str, Any]) -> bool:
+        """Run one claimed prediction; returns False if it was put back in the queue"""
+        patient_data = {key: value for key, value in input_data.items() if key not in ("image_path", "model_version")}
+
+        result = None
+        error_message = None
+        try:
+            result = await get_prediction_batcher().submit(
+                patient_data, input_data.get("image_path"), input_data.get("model_version")
+            )
+        except InferenceQueueFull:
+            return await self._give_back(prediction_id)
+        except Exception as e:
+            logger.error(f"Queued prediction {prediction_id} failed: {str(e)}")
+            error_message = str(e)
+
+        try:
+            await run_in_threadpool(self._finish, prediction_id, result, error_message)
+        except Exception as e:
+            logger.error(f"Failed to store the result of queued prediction {prediction_id}: {str(e)}")
+            return await self._give_back(prediction_id)
+
+        self._claimed.discard(prediction_id)
+        get_prediction_notifier().publish(prediction_id)
+        if result is not None:
+            get_model_rollout().shadow(prediction_id, patient_data, input_data.get("image_path"), result)
+            logger.info(f"Queued prediction {prediction_id} completed successfully")
+        return True
+
+    async def _give_back(self, prediction_id: int) -> bool:
+        """
+        Put a claimed prediction back in the queue; returns False
+
+        If that write fails too, the claim stays: ``stop`` retries the
+        release and other workers reclaim it once ``claim_timeout`` passes.
+        """
+        try:
+            await run_in_threadpool(self._release, [prediction_id])
+        except Exception as e:
+            logger.error(f"Failed to requeue prediction {prediction_id}: {str(e)}")
+            return False
+        self._claimed.discard(prediction_id)
+        get_prediction_notifier().publish(prediction_id)
+        return False
+
+    def _finish(self, prediction_id: int, result: Optional[Dict[str, Any]], error_message: Optional[str]):
+        db = SessionLocal()
+        try:
+            prediction = db.query(Prediction).filter(Prediction.id == prediction_id).first()
+            if prediction is None:
+                return
+            if result is not None:
+                apply_prediction_result(prediction, result)
+            else:
+                mark_prediction_failed(prediction, error_message)
+            commit_with_retry(db)
+            get_response_cache().invalidate_patient(prediction.patient_id)
+        finally:
+            db.close()
+
+    def _release(self, prediction_ids: Iterable[int]):
+        """Put claimed predictions that are still PROCESSING back in the queue"""
+        prediction_ids = list(prediction_ids)
+        db = SessionLocal()
+
+        def release():
+            rows = (
+                db.query(Prediction.id, Prediction.patient_id)
+                .filter(Prediction.id.in_(prediction_ids), Prediction.status == PredictionStatus.PROCESSING.value)
+                .all()
+            )
+            db.query(Prediction).filter(
+                Prediction.id.in_([prediction_id for prediction_id, _ in rows]),
+                Prediction.status == PredictionStatus.PROCESSING.value,
+            ).update({"status": PredictionStatus.PENDING.value, "claimed_at": None}, synchronize_session=False)
+            return rows
+
+        try:
+            rows = commit_with_retry(db, work=release)
+            for _, patient_id in rows:
+                get_response_cache().invalidate_patient(patient_id)
+        finally:
+            db.close()
+
+
+# Singleton instance
+prediction_scheduler = PredictionScheduler(
+    poll_interval=settings.PREDICTION_QUEUE_POLL_INTERVAL,
+    claim_size=settings.PREDICTION_QUEUE_CLAIM_SIZE,
+    claim_timeout=settings.PREDICTION_QUEUE_CLAIM_TIMEOUT,
+)
+
+
+def get_prediction_scheduler() -> PredictionScheduler:
+    """Get prediction scheduler instance"""
+    return prediction_scheduler
@@ -0,0 +1,284 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.services.upload_storage import get_upload_dir, hash_file
+import logging
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever decoding, resampling or normalization changes, so cached
+# tensors from the previous pipeline are no longer used
+PREPROCESSING_VERSION = "1"
+
+IMAGE_EXTENSIONS = (".dcm", ".nii", ".nii.gz", ".gz", ".jpg", ".jpeg", ".png")
+_CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Hashes of files outside the upload store, by (path, inode, size, mtime)
+_HASH_MEMO_SIZE = 1024
+_hash_memo: "OrderedDict[Tuple[str, int, int, int], str]" = OrderedDict()
+_hash_memo_lock = threading.Lock()
+
+
+def is_image_file(image_path: str) -> bool:
+    """Whether the path has an imaging extension the preprocessor can decode"""
+    return str(image_path).lower().endswith(IMAGE_EXTENSIONS)
+
+
+def content_hash_for(path: Path) -> str:
+    """
+    Content hash of an uploaded file
+
+    Blobs in the content-addressed upload store (directly under UPLOAD_DIR)
+    are named by the SHA-256 computed when they were stored and are never
+    rewritten, so the hash is read from the name. Any other file is hashed
+    from disk; the hash is remembered until the file's inode, size or
+    mtime changes.
+    """
+    stem = path.name.split(".", 1)[0]
+    if _CONTENT_HASH_PATTERN.match(stem) and path.resolve().parent == get_upload_dir().resolve():
+        return stem
+
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    with _hash_memo_lock:
+        content_hash = _hash_memo.get(memo_key)
+        if content_hash is not None:
+            _hash_memo.move_to_end(memo_key)
+            return content_hash
+
+    content_hash = hash_file(path)
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = content_hash
+        while len(_hash_memo) > _HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return content_hash
+
+
+def load_image_array(path: Path) -> "np.ndarray":
+    """Decode a DICOM, NIfTI, JPEG or PNG file into a float32 array"""
+    import numpy as np
+
+    name = path.name.lower()
+
+    if name.endswith(".dcm"):
+        try:
+            import pydicom
+        except ImportError:
+            raise ValueError("DICOM support requires pydicom (pip install pydicom)")
+        dataset = pydicom.dcmread(str(path))
+        array = dataset.pixel_array.astype(np.float32)
+        slope = float(getattr(dataset, "RescaleSlope", 1) or 1)
+        intercept = float(getattr(dataset, "RescaleIntercept", 0) or 0)
+        return array * slope + intercept
+
+    if name.endswith((".nii", ".nii.gz", ".gz")):
+        try:
+            import nibabel
+        except ImportError:
+            raise ValueError("NIfTI support requires nibabel (pip install nibabel)")
+        array = np.asarray(nibabel.load(str(path)).get_fdata(dtype=np.float32))
+        if array.ndim >= 3:
+            # NIfTI stores (x, y, z[, t]); put slices first to match DICOM/2D images
+            array = np.moveaxis(array, 2, 0)
+        return array
+
+    if name.endswith((".jpg", ".jpeg", ".png")):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ValueError("JPEG/PNG support requires Pillow (pip install Pillow)")
+        with Image.open(path) as image:
+            return np.asarray(image.convert("L"), dtype=np.float32)
+
+    raise ValueError(f"Unsupported image format: {path.name}")
+
+
+def to_volume(array: "np.ndarray") -> "np.ndarray":
+    """Coerce a decoded image to a (depth, height, width) volume"""
+    import numpy as np
+
+    array = np.squeeze(array)
+    if array.ndim == 2:
+        return array[np.newaxis]
+    if array.ndim == 3:
+        return array
+    if array.ndim == 4:
+        # Time series: keep the first volume
+        return array[..., 0]
+    raise ValueError(f"Unsupported image dimensions: {array.shape}")
+
+
+def resample(volume: "np.ndarray", target_shape: Sequence[int]) -> "np.ndarray":
+    """Linearly resample a volume to exactly ``target_shape``"""
+    import numpy as np
+    from scipy import ndimage
+
+    factors = [target / current for target, current in zip(target_shape, volume.shape)]
+    resampled = ndimage.zoom(volume, factors, order=1)
+
+    # zoom rounds output sizes; crop/pad to the exact shape
+    resampled = resampled[tuple(slice(0, size) for size in target_shape)]
+    padding = [(0, target - current) for target, current in zip(target_shape, resampled.shape)]
+    if any(after for _, after in padding):
+        resampled = np.pad(resampled, padding, mode="edge")
+    return resampled
+
+
+def normalize(volume: "np.ndarray") -> "np.ndarray":
+    """Clip outlier intensities and scale to zero mean, unit variance"""
+    import numpy as np
+
+    low, high = np.percentile(volume, [0.5, 99.5])
+    volume = np.clip(volume, low, high)
+    std = volume.std()
+    if std == 0:
+        return np.zeros_like(volume, dtype=np.float32)
+    return ((volume - volume.mean()) / std).astype(np.float32)
+
+
+class TensorCache:
+    """
+    Size-bounded on-disk cache of preprocessed tensors
+
+    Entries are ``.npy`` files loaded with ``mmap_mode='r'``, so hits cost a
+    page-cache read rather than a decode. Each hit refreshes the file's
+    mtime, and when the cache grows past ``max_bytes`` the least recently
+    used files are deleted.
+
+    Sizes and recency are tracked in memory, so a put does not list the
+    directory. The index is rebuilt from the directory (ordered by mtime)
+    every ``rescan_seconds``, which picks up entries written by other
+    worker processes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, rescan_seconds: float = 60.0):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Path, int]" = OrderedDict()  # least recently used first
+        self._total_bytes = 0
+        self._scanned_at: Optional[float] = None
+
+    def key(self, content_hash: str, target_shape: Sequence[int]) -> str:
+        shape = "x".join(str(size) for size in target_shape)
+        return f"{content_hash}-v{PREPROCESSING_VERSION}-{shape}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key: str) -> Optional["np.ndarray"]:
+        import numpy as np
+
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        return array
+
+    def put(self, key: str, array: "np.ndarray"):
+        import numpy as np
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_name(f".{key}.{os.urandom(4).hex()}.npy")
+        np.save(temp_path, array)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._scanned_at is None or time.monotonic() - self._scanned_at >= self.rescan_seconds:
+                self._rescan()
+            else:
+                self._total_bytes -= self._entries.pop(path, 0)
+                self._entries[path] = path.stat().st_size
+                self._total_bytes += self._entries[path]
+            self._evict()
+
+    def _rescan(self):
+        """Rebuild the index from the cache directory"""
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        self._entries = OrderedDict((path, size) for _, path, size in sorted(entries))
+        self._total_bytes = sum(self._entries.values())
+        self._scanned_at = time.monotonic()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+            logger.debug(f"Evicted cached tensor {path.name}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+
+class ImagePreprocessor:
+    """
+    Decode, resample and normalize medical images into fixed-shape tensors
+
+    Every supported format becomes a float32 volume of IMAGE_TARGET_SHAPE
+    (depth, height, width); 2D images are stretched along the depth axis.
+    Results are cached by upload content hash and PREPROCESSING_VERSION.
+    """
+
+    def __init__(self, target_shape: Sequence[int], cache: TensorCache):
+        self.target_shape: Tuple[int, ...] = tuple(target_shape)
+        self.cache = cache
+
+    def preprocess(self, image_path: str) -> "np.ndarray":
+        path = Path(image_path)
+        if not path.is_file():
+            raise ValueError(f"Image not found: {image_path}")
+
+        key = self.cache.key(content_hash_for(path), self.target_shape)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            volume = normalize(resample(to_volume(load_image_array(path)), self.target_shape))
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to decode image {path.name}: {str(e)}")
+
+        self.cache.put(key, volume)
+        logger.info(f"Preprocessed image {path.name} to {volume.shape}")
+        return volume
+
+
+# Singleton instance
+image_preprocessor = ImagePreprocessor(
+    target_shape=settings.IMAGE_TARGET_SHAPE,
+    cache=TensorCache(settings.PREPROCESS_CACHE_DIR, settings.PREPROCESS_CACHE_MAX_BYTES),
+)
+
+
+def get_image_preprocessor() -> ImagePreprocessor:
+    """Get image preprocessor instance"""
+    return image_preprocessor
@@ -0,0 +1,189 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.metrics import get_metrics
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag of a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value (``*`` or a list of tags) covers ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class CachedResponse:
+    """Serialized JSON body of a response, its ETag and extra headers"""
+
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.etag = make_etag(body)
+        self.headers = headers or {}
+
+
+class ResponseCache:
+    """
+    In-process read-through cache of serialized /results responses
+
+    - Predictions are cached by id once they are completed or failed; they
+      never change after that, so the entries do not expire.
+    - Patient history pages are cached by (patient, limit, cursor) and
+      dropped by ``invalidate_patient`` whenever a prediction of that
+      patient is written. Writes in other workers cannot invalidate this
+      worker's entries, so history entries also expire after
+      ``history_ttl_seconds``.
+
+    A read that started before an invalidation of its patient does not
+    store its (possibly stale) page: callers take a ``token`` before
+    querying and pass it to ``put_history``. Invalidations are remembered
+    for ``history_ttl_seconds``; a read that started before a forgotten
+    one is not stored either.
+
+    Least recently used entries are evicted beyond ``max_entries``; 0
+    disables caching. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 10000, history_ttl_seconds: float = 5.0):
+        self.max_entries = max_entries
+        self.history_ttl_seconds = history_ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], CachedResponse]]" = OrderedDict()
+        self._patient_keys: Dict[str, Set[Hashable]] = {}
+        self._writes = 0
+        # Latest invalidation of each patient: (write counter, monotonic time), oldest first
+        self._last_write: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._forgotten_writes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get_prediction(self, prediction_id: int) -> Optional[CachedResponse]:
+        return self._get(("prediction", prediction_id))
+
+    def get_history(self, patient_id: str, limit: int, cursor: Optional[int]) -> Optional[CachedResponse]:
+        return self._get(("patient", patient_id, limit, cursor))
+
+    def _get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, response = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def token(self) -> int:
+        """Write counter to take before reading a history page from the database"""
+        return self._writes
+
+    def put_prediction(self, prediction_id: int, response: CachedResponse):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._store(("prediction", prediction_id), None, response)
+
+    def put_history(self, patient_id: str, limit: int, cursor: Optional[int], response: CachedResponse, token: int):
+        if not self.enabled:
+            return
+        key = ("patient", patient_id, limit, cursor)
+        with self._lock:
+            last_write = self._last_write.get(patient_id)
+            if token < self._forgotten_writes or (last_write is not None and last_write[0] > token):
+                return
+            self._store(key, time.monotonic() + self.history_ttl_seconds, response)
+            self._patient_keys.setdefault(patient_id, set()).add(key)
+
+    def invalidate_patient(self, patient_id: str):
+        """Drop cached history of a patient after one of its predictions was written"""
+        now = time.monotonic()
+        with self._lock:
+            self._writes += 1
+            self._last_write[patient_id] = (self._writes, now)
+            self._last_write.move_to_end(patient_id)
+            # Only reads in flight during a write need its record, and reads outlasting the TTL are not stored
+            while self._last_write:
+                write, written_at = next(iter(self._last_write.values()))
+                if written_at > now - self.history_ttl_seconds:
+                    break
+                self._last_write.popitem(last=False)
+                self._forgotten_writes = write
+
+            keys = self._patient_keys.pop(patient_id, ())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._patient_keys.clear()
+
+    def _store(self, key: Hashable, expires_at: Optional[float], response: CachedResponse):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable):
+        self._entries.pop(key, None)
+        if key[0] == "patient":
+            keys = self._patient_keys.get(key[1])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._patient_keys[key[1]]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "history_ttl_seconds": self.history_ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    history_ttl_seconds=settings.RESPONSE_CACHE_HISTORY_TTL_SECONDS,
+)
+
+
+def get_response_cache() -> ResponseCache:
+    """Get /results response cache instance"""
+    return response_cache
+
+
+get_metrics().gauge("response_cache_entries", "Serialized /results responses held in the cache", lambda: len(get_response_cache()))
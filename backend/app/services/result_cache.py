@@ -0,0 +1,117 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import get_metrics
+from app.services.preprocessing import content_hash_for
+
+
+def prediction_cache_key(patient_data: Dict[str, Any], image_path: Optional[str], model_version: str) -> str:
+    """
+    Fingerprint of a prediction input
+
+    Canonical JSON (sorted keys) of the request fields, the content hash of
+    the image rather than its path, and the model version, hashed with
+    SHA-256. A missing image file yields the path itself, so the request
+    still reaches inference and fails there.
+    """
+    image_hash = None
+    if image_path:
+        path = Path(image_path)
+        image_hash = content_hash_for(path) if path.is_file() else f"path:{image_path}"
+
+    payload = json.dumps(
+        {"request": patient_data, "image": image_hash, "model_version": model_version},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    In-process LRU cache of prediction results with a TTL
+
+    Thread-safe, so it can be shared by the event loop and the threadpool.
+    A ``max_entries`` of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Singleton instance
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+)
+
+
+def get_result_cache() -> ResultCache:
+    """Get prediction result cache instance"""
+    return result_cache
+
+
+get_metrics().gauge("result_cache_entries", "Prediction results held in the cache", lambda: len(get_result_cache()))
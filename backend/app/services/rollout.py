@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.metrics import Counter, get_metrics
+from app.db.database import SessionLocal, commit_with_retry
+from app.models.prediction import Prediction
+from app.services.batching import MicroBatcher
+from app.services.inference_executor import InferenceExecutor, InferenceQueueFull, get_inference_executor
+from app.services.ml_service import run_prediction_batch
+from app.services.model_registry import ModelRegistry, get_model_registry
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Result fields copied into the shadow record stored with the primary prediction
+SHADOW_FIELDS = ("model_version", "has_alzheimer", "confidence_score", "risk_level", "processing_time")
+
+# Shared by every ModelRollout in the process
+shadow_runs = get_metrics().register(Counter(
+    "shadow_evaluations_total", "Shadow model runs by outcome (agree, disagree, failed, skipped)",
+    ("outcome",),
+))
+
+
+def _bucket(routing_key: str) -> float:
+    """Stable position of a routing key in [0, 100)"""
+    digest = hashlib.sha1(routing_key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % 10000 / 100
+
+
+class ModelRollout:
+    """
+    Canary routing and shadow evaluation of a candidate model version
+
+    - Canary: ``canary_percent`` of the requests that do not name a model
+      version are served by ``canary_version``. Routing hashes the patient
+      id, so a patient always gets the same model while the percentage is
+      unchanged.
+    - Shadow: after a prediction is stored, ``shadow_version`` runs on the
+      same input in a background task, and its result is written to the
+      prediction's ``result_data["shadow"]`` with an ``agrees`` flag. The
+      response never waits for it. Shadow inference runs on its own small
+      executor, so it never takes a slot or queue position from primary
+      requests. Shadow runs are shed first: they are skipped when primary
+      requests are already queueing for a worker, when the shadow
+      executor is full, or when ``shadow_max_pending`` runs are waiting.
+
+    Canary and shadow versions are pinned in the model registry so memory
+    budget eviction does not unload them.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        canary_version: Optional[str] = None,
+        canary_percent: float = 0.0,
+        shadow_version: Optional[str] = None,
+        shadow_sample_rate: float = 1.0,
+        shadow_max_pending: int = 64,
+        shadow_executor: Optional[InferenceExecutor] = None,
+    ):
+        self.registry = registry
+        self.canary_version: Optional[str] = None
+        self.canary_percent = 0.0
+        self.shadow_version: Optional[str] = None
+        self.shadow_sample_rate = 1.0
+        self.shadow_max_pending = max(1, shadow_max_pending)
+        self.shadow_executor = shadow_executor or InferenceExecutor("thread", max_workers=1, max_queue=0)
+        self._batcher = MicroBatcher(
+            run_prediction_batch,
+            max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+            max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS,
+            executor=self.shadow_executor,
+        )
+        self._tasks: set = set()
+        self.shadow_runs = shadow_runs
+
+        try:
+            self.configure(canary_version, canary_percent, shadow_version, shadow_sample_rate, preload=False)
+        except (KeyError, ValueError) as e:
+            logger.error(f"Invalid model rollout settings, canary and shadow disabled: {str(e)}")
+
+    def configure(
+        self,
+        canary_version: Optional[str] = None,
+        canary_percent: float = 0.0,
+        shadow_version: Optional[str] = None,
+        shadow_sample_rate: float = 1.0,
+        preload: bool = True,
+    ):
+        """
+        Replace the rollout configuration
+
+        With ``preload`` the candidate versions are loaded before the new
+        configuration takes effect, so no request or shadow run pays for
+        the load. Raises KeyError for unknown versions and ValueError for
+        percentages or rates out of range.
+        """
+        if not 0.0 <= canary_percent <= 100.0:
+            raise ValueError("canary_percent must be between 0 and 100")
+        if not 0.0 <= shadow_sample_rate <= 1.0:
+            raise ValueError("shadow_sample_rate must be between 0 and 1")
+        for version in (canary_version, shadow_version):
+            if version and preload:
+                self.registry.get(version)
+            elif version:
+                self.registry.resolve(version)
+
+        for version in (self.canary_version, self.shadow_version):
+            if version:
+                self.registry.unpin(version)
+        for version in (canary_version, shadow_version):
+            if version:
+                self.registry.pin(version)
+
+        self.canary_version = canary_version or None
+        self.canary_percent = canary_percent if canary_version else 0.0
+        self.shadow_version = shadow_version or None
+        self.shadow_sample_rate = shadow_sample_rate
+        logger.info(
+            f"Model rollout: canary={self.canary_version} ({self.canary_percent}%), "
+            f"shadow={self.shadow_version} (sample rate {self.shadow_sample_rate})"
+        )
+
+    def preload(self):
+        """Load the configured canary and shadow versions"""
+        for version in (self.canary_version, self.shadow_version):
+            if version:
+                self.registry.get(version)
+
+    def route(self, requested_version: Optional[str], routing_key: str) -> Tuple[str, bool]:
+        """
+        Version that serves a request, and whether it was routed to the canary
+
+        An explicitly requested version is always honoured. Raises KeyError
+        for unknown versions.
+        """
+        if requested_version is None and self.canary_version and self.canary_percent > 0:
+            if _bucket(routing_key) < self.canary_percent:
+                return self.canary_version, True
+        return self.registry.resolve(requested_version), False
+
+    def shadow(
+        self,
+        prediction_id: int,
+        patient_data: Dict[str, Any],
+        image_path: Optional[str],
+        primary_result: Dict[str, Any],
+    ):
+        """Schedule a shadow run for a stored prediction, if one is due"""
+        version = self.shadow_version
+        if version is None or version == primary_result.get("model_version"):
+            return
+        if self.shadow_sample_rate < 1.0 and random.random() >= self.shadow_sample_rate:
+            return
+        if (
+            len(self._tasks) >= self.shadow_max_pending
+            or get_inference_executor().queue_depth > 0
+            or get_inference_executor().is_saturated
+        ):
+            self.shadow_runs.inc("skipped")
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            self._run_shadow(version, prediction_id, patient_data, image_path, primary_result)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_shadow(
+        self,
+        version: str,
+        prediction_id: int,
+        patient_data: Dict[str, Any],
+        image_path: Optional[str],
+        primary_result: Dict[str, Any],
+    ):
+        try:
+            result = await self._batcher.submit(patient_data, image_path, version)
+        except InferenceQueueFull:
+            self.shadow_runs.inc("skipped")
+            return
+        except Exception as e:
+            logger.warning(f"Shadow model {version} failed for prediction {prediction_id}: {str(e)}")
+            self.shadow_runs.inc("failed")
+            shadow = {"model_version": version, "error": str(e)}
+        else:
+            shadow = {field: result.get(field) for field in SHADOW_FIELDS}
+            shadow["agrees"] = bool(result["has_alzheimer"]) == bool(primary_result["has_alzheimer"])
+            shadow["confidence_delta"] = round(result["confidence_score"] - primary_result["confidence_score"], 4)
+            self.shadow_runs.inc("agree" if shadow["agrees"] else "disagree")
+
+        try:
+            await run_in_threadpool(self._store, prediction_id, shadow)
+        except Exception as e:
+            logger.error(f"Failed to store shadow result for prediction {prediction_id}: {str(e)}")
+
+    def _store(self, prediction_id: int, shadow: Dict[str, Any]):
+        db = SessionLocal()
+        try:
+            prediction = db.query(Prediction).filter(Prediction.id == prediction_id).first()
+            if prediction is None:
+                return
+            # Reassign rather than mutate: plain JSON columns do not track in-place changes
+            prediction.result_data = {**(prediction.result_data or {}), "shadow": shadow}
+            commit_with_retry(db)
+        finally:
+            db.close()
+
+    async def stop(self):
+        """Cancel shadow runs that have not finished"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.shadow_executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "canary_version": self.canary_version,
+            "canary_percent": self.canary_percent,
+            "shadow_version": self.shadow_version,
+            "shadow_sample_rate": self.shadow_sample_rate,
+            "shadow_pending": len(self._tasks),
+            "shadow_inference": self.shadow_executor.stats(),
+        }
+
+
+# Singleton instance
+model_rollout = ModelRollout(
+    get_model_registry(),
+    canary_version=settings.MODEL_CANARY_VERSION,
+    canary_percent=settings.MODEL_CANARY_PERCENT,
+    shadow_version=settings.MODEL_SHADOW_VERSION,
+    shadow_sample_rate=settings.MODEL_SHADOW_SAMPLE_RATE,
+    shadow_max_pending=settings.MODEL_SHADOW_MAX_PENDING,
+    shadow_executor=InferenceExecutor(
+        kind="process" if settings.INFERENCE_EXECUTOR == "process" else "thread",
+        max_workers=settings.MODEL_SHADOW_MAX_WORKERS,
+        max_queue=settings.MODEL_SHADOW_MAX_PENDING,
+    ),
+)
+
+
+def get_model_rollout() -> ModelRollout:
+    """Get model rollout instance"""
+    return model_rollout
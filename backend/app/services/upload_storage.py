@@ -0,0 +1,423 @@
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import get_metrics
+from app.models.upload import UploadBlob
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+SESSION_DIR_NAME = ".sessions"
+_UPLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+HASH_READ_SIZE = 4 * 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload grows past MAX_UPLOAD_SIZE"""
+
+
+class UploadSessionError(Exception):
+    """Raised for invalid operations on a resumable upload session"""
+
+
+def get_upload_dir() -> Path:
+    """Return the upload directory, creating it if needed"""
+    upload_dir = Path(settings.UPLOAD_DIR)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return upload_dir
+
+
+def temporary_upload_path() -> Path:
+    """Path for an in-progress upload, hidden from the stored files"""
+    return get_upload_dir() / f".{os.urandom(8).hex()}.part"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 hex digest of a file on disk"""
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(HASH_READ_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def store_blob(db: Session, part_path: Path, content_hash: str, extension: str, file_size: int) -> Dict[str, Any]:
+    """
+    Move a finished upload into the content-addressed store
+
+    Blobs are named ``{sha256}{extension}``. If the content is already
+    stored, the new copy is discarded and the existing blob's reference
+    count is incremented instead.
+    """
+    upload_dir = get_upload_dir()
+    blob = db.query(UploadBlob).filter(UploadBlob.content_hash == content_hash).first()
+
+    if blob is not None and (upload_dir / blob.filename).exists():
+        updated = (
+            db.query(UploadBlob)
+            .filter(UploadBlob.id == blob.id)
+            .update({UploadBlob.ref_count: UploadBlob.ref_count + 1}, synchronize_session=False)
+        )
+        db.commit()
+        if updated:
+            logger.info(f"Deduplicated upload against {blob.filename}")
+            return _blob_info(upload_dir, blob.filename, blob.file_size, content_hash, deduplicated=True)
+        # The blob was released concurrently: store this copy as a new one
+        blob = None
+
+    filename = blob.filename if blob is not None else f"{content_hash}{extension.lower()}"
+    os.replace(part_path, upload_dir / filename)
+
+    if blob is not None:
+        # Row survived but the file was missing: the restored file starts a new reference
+        blob.ref_count += 1
+        db.commit()
+    else:
+        try:
+            db.add(UploadBlob(content_hash=content_hash, filename=filename, file_size=file_size, ref_count=1))
+            db.commit()
+        except IntegrityError:
+            # Another request stored the same content first; share its row
+            db.rollback()
+            db.query(UploadBlob).filter(UploadBlob.content_hash == content_hash).update(
+                {UploadBlob.ref_count: UploadBlob.ref_count + 1}, synchronize_session=False
+            )
+            db.commit()
+
+    return _blob_info(upload_dir, filename, file_size, content_hash, deduplicated=False)
+
+
+def release_blob(db: Session, filename: str) -> Optional[int]:
+    """
+    Drop one reference to a stored blob
+
+    The file is only removed once no reference is left.
+
+    Returns:
+        Remaining reference count, or None if ``filename`` is not a tracked blob
+    """
+    blob = db.query(UploadBlob).filter(UploadBlob.filename == filename).first()
+    if blob is None:
+        return None
+
+    db.query(UploadBlob).filter(UploadBlob.id == blob.id, UploadBlob.ref_count > 0).update(
+        {UploadBlob.ref_count: UploadBlob.ref_count - 1}, synchronize_session=False
+    )
+    db.commit()
+    db.refresh(blob)
+
+    if blob.ref_count > 0:
+        return blob.ref_count
+
+    deleted = db.query(UploadBlob).filter(UploadBlob.id == blob.id, UploadBlob.ref_count == 0).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    if deleted:
+        (get_upload_dir() / filename).unlink(missing_ok=True)
+        logger.info(f"Removed unreferenced blob {filename}")
+    return 0
+
+
+def _blob_info(upload_dir: Path, filename: str, file_size: int, content_hash: str, deduplicated: bool) -> Dict[str, Any]:
+    return {
+        "filename": filename,
+        "file_path": str(upload_dir / filename),
+        "file_size": file_size,
+        "content_hash": content_hash,
+        "deduplicated": deduplicated,
+    }
+
+
+async def iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's content in UPLOAD_CHUNK_SIZE chunks"""
+    while True:
+        chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def write_stream(
+    chunks: AsyncIterator[bytes],
+    destination: Path,
+    max_size: int,
+    start_offset: int = 0,
+    hasher: Optional[Any] = None,
+) -> int:
+    """
+    Write an async byte stream to ``destination``
+
+    Appends when ``start_offset`` is non-zero. Chunks are coalesced into
+    UPLOAD_CHUNK_SIZE writes, which run in the threadpool so disk I/O (and
+    updating ``hasher``, if given) never blocks the event loop. Raises
+    UploadTooLarge as soon as the total size (including ``start_offset``)
+    passes ``max_size``.
+
+    Returns:
+        Number of bytes written by this call
+    """
+    handle = await run_in_threadpool(open, destination, "ab" if start_offset else "wb")
+    total = start_offset
+    buffer = bytearray()
+    write_time = 0.0
+
+    def write(data: bytearray):
+        nonlocal write_time
+        started = time.perf_counter()
+        handle.write(data)
+        if hasher is not None:
+            hasher.update(data)
+        write_time += time.perf_counter() - started
+
+    try:
+        async for chunk in chunks:
+            total += len(chunk)
+            if total > max_size:
+                raise UploadTooLarge(f"Upload exceeds maximum size of {max_size} bytes")
+
+            buffer += chunk
+            if len(buffer) >= settings.UPLOAD_CHUNK_SIZE:
+                data, buffer = buffer, bytearray()
+                await run_in_threadpool(write, data)
+
+        if buffer:
+            await run_in_threadpool(write, buffer)
+    finally:
+        await run_in_threadpool(handle.close)
+        # Disk and hashing time only; waiting for the client's bytes is excluded
+        get_metrics().observe_stage("upload_write", write_time)
+
+    return total - start_offset
+
+
+async def save_stream(chunks: AsyncIterator[bytes], filename: str, db: Session) -> Dict[str, Any]:
+    """
+    Stream an upload into the content-addressed store
+
+    The SHA-256 is computed while the data is written to a temporary file,
+    which then either becomes the blob or, for content that is already
+    stored, is discarded in favour of the existing blob.
+    """
+    part_path = temporary_upload_path()
+    hasher = hashlib.sha256()
+
+    try:
+        file_size = await write_stream(chunks, part_path, settings.MAX_UPLOAD_SIZE, hasher=hasher)
+        with get_metrics().time_stage("upload_store"):
+            return await run_in_threadpool(
+                store_blob, db, part_path, hasher.hexdigest(), Path(filename).suffix, file_size
+            )
+    finally:
+        await run_in_threadpool(part_path.unlink, missing_ok=True)
+
+
+async def save_upload_file(file: UploadFile, db: Session) -> Dict[str, Any]:
+    """Persist a multipart UploadFile without a separate size check pass"""
+    return await save_stream(iter_upload_file(file), file.filename, db)
+
+
+class UploadSessionStore:
+    """
+    Resumable chunked uploads
+
+    Each session is a JSON metadata file plus a ``.part`` data file under
+    ``UPLOAD_DIR/.sessions``. The size of the ``.part`` file is the current
+    offset, so sessions survive restarts and are shared by all workers that
+    see the same upload directory. Clients append chunks at the current
+    offset and resume after a failure by asking for it again.
+
+    A chunk write holds an exclusive ``flock`` on the session's metadata
+    file, so two workers cannot append to the same session at once. Where
+    ``fcntl`` is unavailable the guard is per process only, and a session
+    must stay on a single worker.
+
+    Sessions that received no data for ``ttl_seconds`` are deleted by
+    ``sweep``, which ``create`` runs at most every ``sweep_interval``
+    seconds. Methods other than ``append`` do blocking file I/O; call them
+    from the threadpool.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 3600, sweep_interval: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._busy: Set[str] = set()
+        self._swept_at: Optional[float] = None
+
+    def _session_dir(self) -> Path:
+        session_dir = get_upload_dir() / SESSION_DIR_NAME
+        session_dir.mkdir(parents=True, exist_ok=True)
+        return session_dir
+
+    def _paths(self, upload_id: str):
+        if not _UPLOAD_ID_PATTERN.match(upload_id):
+            raise UploadSessionError("Invalid upload id")
+        session_dir = self._session_dir()
+        return session_dir / f"{upload_id}.json", session_dir / f"{upload_id}.part"
+
+    @contextmanager
+    def _write_lock(self, upload_id: str):
+        """
+        Exclusive right to write to a session, across worker processes
+
+        Raises UploadSessionError when another writer holds it and KeyError
+        when the session does not exist.
+        """
+        if fcntl is None:
+            if upload_id in self._busy:
+                raise UploadSessionError("Another chunk is being written to this upload")
+            self._busy.add(upload_id)
+            try:
+                yield
+            finally:
+                self._busy.discard(upload_id)
+            return
+
+        meta_path, _ = self._paths(upload_id)
+        try:
+            lock_file = open(meta_path, "rb")
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        try:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadSessionError("Another chunk is being written to this upload")
+            yield
+        finally:
+            # Closing the file releases the lock
+            lock_file.close()
+
+    def create(self, filename: str, total_size: int) -> Dict[str, Any]:
+        if total_size > settings.MAX_UPLOAD_SIZE:
+            raise UploadTooLarge(f"Upload exceeds maximum size of {settings.MAX_UPLOAD_SIZE} bytes")
+
+        if self._swept_at is None or time.monotonic() - self._swept_at >= self.sweep_interval:
+            self.sweep()
+
+        upload_id = os.urandom(16).hex()
+        meta_path, part_path = self._paths(upload_id)
+        part_path.touch()
+        meta_path.write_text(json.dumps({"filename": Path(filename).name, "total_size": total_size}))
+        logger.info(f"Created upload session {upload_id} for {filename} ({total_size} bytes)")
+        return self.get(upload_id)
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        meta_path, part_path = self._paths(upload_id)
+        if not meta_path.exists():
+            return None
+
+        meta = json.loads(meta_path.read_text())
+        return {
+            "upload_id": upload_id,
+            "filename": meta["filename"],
+            "total_size": meta["total_size"],
+            "offset": part_path.stat().st_size if part_path.exists() else 0,
+        }
+
+    async def append(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        db: Session,
+    ) -> Dict[str, Any]:
+        """
+        Append a chunk at ``offset``
+
+        Returns the session state, plus the stored file's details once the
+        last byte has arrived.
+        """
+        with self._write_lock(upload_id):
+            session = await run_in_threadpool(self.get, upload_id)
+            if session is None:
+                raise KeyError(upload_id)
+            if offset != session["offset"]:
+                raise UploadSessionError(f"Offset mismatch: expected {session['offset']}, got {offset}")
+
+            _, part_path = self._paths(upload_id)
+            try:
+                written = await write_stream(chunks, part_path, session["total_size"], start_offset=offset)
+            except UploadTooLarge:
+                # Drop the bytes past total_size so the client can retry from a clean offset
+                await run_in_threadpool(os.truncate, part_path, offset)
+                raise
+            session["offset"] = offset + written
+
+            if session["offset"] == session["total_size"]:
+                session.update(await run_in_threadpool(self._finalize, db, upload_id, session))
+            return session
+
+    def _finalize(self, db: Session, upload_id: str, session: Dict[str, Any]) -> Dict[str, Any]:
+        meta_path, part_path = self._paths(upload_id)
+        stored = store_blob(
+            db, part_path, hash_file(part_path), Path(session["filename"]).suffix, session["total_size"]
+        )
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink()
+        logger.info(f"Upload session {upload_id} completed: {stored['filename']}")
+        return {
+            "completed": True,
+            "stored_filename": stored["filename"],
+            "file_path": stored["file_path"],
+            "content_hash": stored["content_hash"],
+            "deduplicated": stored["deduplicated"],
+        }
+
+    def sweep(self) -> int:
+        """Delete sessions idle for longer than ``ttl_seconds``; returns how many"""
+        self._swept_at = time.monotonic()
+        expired_before = time.time() - self.ttl_seconds
+        swept = 0
+        for part_path in self._session_dir().glob("*.part"):
+            upload_id = part_path.stem
+            try:
+                meta_path, _ = self._paths(upload_id)
+                if not meta_path.exists():
+                    # Left behind by a create that failed halfway
+                    if part_path.stat().st_mtime < expired_before:
+                        part_path.unlink()
+                    continue
+                with self._write_lock(upload_id):
+                    if max(meta_path.stat().st_mtime, part_path.stat().st_mtime) >= expired_before:
+                        continue
+                    meta_path.unlink()
+                    part_path.unlink()
+            except (KeyError, UploadSessionError, FileNotFoundError):
+                # Not a session, or completed, aborted or being written meanwhile
+                continue
+            swept += 1
+            logger.info(f"Deleted expired upload session {upload_id}")
+        return swept
+
+    def abort(self, upload_id: str) -> bool:
+        meta_path, part_path = self._paths(upload_id)
+        if not meta_path.exists():
+            return False
+        meta_path.unlink()
+        part_path.unlink(missing_ok=True)
+        return True
+
+
+# Singleton instance
+upload_session_store = UploadSessionStore(ttl_seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+
+
+def get_upload_session_store() -> UploadSessionStore:
+    """Get resumable upload session store"""
+    return upload_session_store
@@ -0,0 +1,118 @@
+"""
+Cold start benchmark: time until a fresh worker answers /ping and /health
+
+Starts ``uvicorn app.main:app`` against a scratch database once per mode
+and polls the server, printing the time from spawning the process until
+/ping and /health first answer, until the model is warm, and the startup
+phases the worker reports on /health:
+
+- blocking: the model is loaded and warmed up in the startup hook
+- background: the startup hook schedules warmup and returns
+  (MODEL_BACKGROUND_WARMUP=true)
+
+Usage (from the backend directory):
+    python -m benchmarks.cold_start --model-path models/alzheimer_model.pkl
+    python -m benchmarks.cold_start --modes background --runs 5
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+from benchmarks.common import summarize
+
+MODES = ("blocking", "background")
+POLL_INTERVAL = 0.005
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_json(url: str) -> Optional[Dict[str, Any]]:
+    """Decoded JSON body of a GET, or None while the server is not answering"""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return json.loads(response.read())
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+
+def wait_for(predicate, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError("Server did not become ready in time")
+
+
+def warm_report(health_url: str) -> Optional[Dict[str, Any]]:
+    """/health body once warmup has finished (or was skipped or failed)"""
+    body = get_json(health_url)
+    if body and body["startup"]["warmup"] not in ("pending", "running"):
+        return body
+    return None
+
+
+def cold_start(mode: str, model_path: Optional[str], timeout: float) -> Dict[str, Any]:
+    """Spawn one worker and time its startup"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    scratch_dir = tempfile.mkdtemp(prefix="alzheimer-bench-")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{scratch_dir}/bench.db",
+        UPLOAD_DIR=os.path.join(scratch_dir, "uploads"),
+        MODEL_BACKGROUND_WARMUP="true" if mode == "background" else "false",
+        PREDICTION_QUEUE_ENABLED="false",
+    )
+    if model_path:
+        env["MODEL_PATH"] = model_path
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(lambda: get_json(f"{base_url}/ping"), timeout)
+        ping = time.perf_counter() - started
+        wait_for(lambda: get_json(f"{base_url}/api/v1/health"), timeout)
+        health = time.perf_counter() - started
+        report = wait_for(lambda: warm_report(f"{base_url}/api/v1/health"), timeout)
+        warm = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait()
+    return {"ping": ping, "health": health, "warm": warm, "startup": report["startup"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--model-path", help="Model file to load (defaults to MODEL_PATH)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        runs = [cold_start(mode, args.model_path, args.timeout) for _ in range(args.runs)]
+        for key in ("ping", "health", "warm"):
+            print(f"{mode:<10} {key:<6} p50={summarize([run[key] for run in runs])['p50_ms']}ms")
+        print(f"{mode:<10} phases {runs[-1]['startup']['phases']}")
+
+
+if __name__ == "__main__":
+    main()
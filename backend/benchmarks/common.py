@@ -0,0 +1,36 @@
+import os
+import tempfile
+from typing import Dict, List
+
+
+def use_scratch_database() -> str:
+    """
+    Point the app at a throwaway SQLite database
+
+    Must be called before importing anything from ``app`` so that Settings
+    picks up the overridden environment.
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="alzheimer-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{scratch_dir}/bench.db")
+    os.environ.setdefault("UPLOAD_DIR", os.path.join(scratch_dir, "uploads"))
+    return scratch_dir
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
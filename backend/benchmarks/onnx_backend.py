@@ -0,0 +1,115 @@
+"""
+Inference backend benchmark: joblib (pickle) vs ONNX Runtime
+
+Trains a scikit-learn classifier on synthetic ``[age, gender]`` features,
+saves it with joblib, exports it to ONNX, and loads each file through
+MLModelService. For each batch size it reports the latency of one
+``predict_batch`` call and the throughput of ``--threads`` threads calling
+it concurrently, as the thread inference executor would. Needs
+onnxruntime and skl2onnx.
+
+Usage (from the backend directory):
+    python -m benchmarks.onnx_backend --estimator forest --trees 200 --batch-sizes 1 32 1024
+    ONNX_INTRA_OP_THREADS=2 python -m benchmarks.onnx_backend --threads 4
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.common import summarize
+
+ESTIMATORS = ("forest", "boosting", "logistic")
+
+
+def train(estimator: str, trees: int, rows: int = 5000):
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    features = np.column_stack([rng.integers(40, 95, rows), rng.integers(0, 3, rows)]).astype(np.float64)
+    labels = (rng.random(rows) < (features[:, 0] - 40) / 60).astype(int)
+
+    if estimator == "forest":
+        model = RandomForestClassifier(n_estimators=trees, max_depth=12, random_state=0)
+    elif estimator == "boosting":
+        model = GradientBoostingClassifier(n_estimators=trees, max_depth=4, random_state=0)
+    else:
+        model = LogisticRegression()
+    return model.fit(features, labels)
+
+
+def records(batch_size: int):
+    return [
+        {"patient_id": f"BENCH{i}", "age": 50 + i % 45, "gender": ("male", "female", "other")[i % 3]}
+        for i in range(batch_size)
+    ]
+
+
+def measure(service, batch_size: int, repeats: int, threads: int):
+    batch = records(batch_size)
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        service.predict_batch(batch)
+        latencies.append(time.perf_counter() - started)
+
+    calls = repeats * threads
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda _: service.predict_batch(batch), range(calls)))
+    throughput = calls * batch_size / (time.perf_counter() - started)
+    return summarize(latencies), throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimator", choices=ESTIMATORS, default="forest")
+    parser.add_argument("--trees", type=int, default=200)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 32, 1024])
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent callers for the throughput run")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    import joblib
+
+    from app.services.ml_service import MLModelService, export_onnx
+
+    scratch = tempfile.mkdtemp(prefix="alzheimer-bench-")
+    pickle_path = os.path.join(scratch, "model.pkl")
+    onnx_path = os.path.join(scratch, "model.onnx")
+    joblib.dump(train(args.estimator, args.trees), pickle_path)
+    export_onnx(pickle_path, onnx_path)
+
+    services = {}
+    for name, path in (("joblib", pickle_path), ("onnx", onnx_path)):
+        service = MLModelService(model_version=name, model_path=path)
+        service.load_model()
+        if not service.is_loaded:
+            raise SystemExit(f"Failed to load the {name} model")
+        service.warmup()
+        services[name] = service
+        print(f"{name:<7} load={service.load_time}s  file={os.path.getsize(path) / 2**20:.1f}MB  {service.backend.stats()}")
+
+    # Both backends must agree before their speed is worth comparing
+    batch = records(max(args.batch_sizes))
+    scores = {name: [r["confidence_score"] for r in service.predict_batch(batch)] for name, service in services.items()}
+    print(f"max |confidence difference| = {np.max(np.abs(np.subtract(scores['joblib'], scores['onnx']))):.4f}\n")
+
+    for batch_size in args.batch_sizes:
+        for name, service in services.items():
+            latency, throughput = measure(service, batch_size, args.repeats, args.threads)
+            print(
+                f"batch={batch_size:<5} {name:<7} p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms  "
+                f"{args.threads} threads: {throughput:,.0f} predictions/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
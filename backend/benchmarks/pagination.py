@@ -0,0 +1,117 @@
+"""
+Page latency benchmark for GET /results and /results/patient/{patient_id}
+
+Seeds the scratch database with ``--rows`` predictions, then fetches pages
+at increasing depths with offset pagination (``skip``) and with keyset
+pagination (``cursor``), and prints p50/p99 latency per depth. Offset pages
+get slower with depth because the skipped rows are still read; keyset pages
+seek on the ``(created_at, id)`` indexes and stay flat. The patient route
+only supports cursors, so only keyset latency is shown for it.
+
+Usage (from the backend directory):
+    python -m benchmarks.pagination --rows 500000 --depths 0 10000 100000 400000
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from benchmarks.common import summarize, use_scratch_database
+
+use_scratch_database()
+
+import httpx  # noqa: E402
+
+from app.db.database import SessionLocal, create_tables, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Prediction  # noqa: E402
+
+PATIENTS = 100
+SEED_CHUNK = 10000
+
+
+def seed(rows: int):
+    """Bulk insert completed predictions, several per second so created_at has ties"""
+    create_tables()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as connection:
+        for offset in range(0, rows, SEED_CHUNK):
+            connection.execute(
+                Prediction.__table__.insert(),
+                [
+                    {
+                        "patient_id": f"BENCH{i % PATIENTS}",
+                        "status": "completed",
+                        "has_alzheimer": i % 2,
+                        "confidence_score": 0.5,
+                        "risk_level": "moderate",
+                        "processing_time": 0.01,
+                        "model_version": "bench",
+                        "created_at": start + timedelta(seconds=i // 4),
+                    }
+                    for i in range(offset, min(rows, offset + SEED_CHUNK))
+                ],
+            )
+
+
+def cursor_at(depth: int, patient_id: Optional[str] = None) -> str:
+    """Cursor pointing just before the row at ``depth`` (found with one untimed offset query)"""
+    db = SessionLocal()
+    try:
+        query = db.query(Prediction.id)
+        if patient_id:
+            query = query.filter(Prediction.patient_id == patient_id)
+        row = query.order_by(Prediction.created_at.desc(), Prediction.id.desc()).offset(depth - 1).first()
+        return str(row.id)
+    finally:
+        db.close()
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, repeats: int):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = await client.get(path, params=params)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return summarize(latencies)
+
+
+async def run(depths, page_size: int, repeats: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print("/results")
+        for depth in depths:
+            offset = await measure(client, "/api/v1/results", {"skip": depth, "limit": page_size}, repeats)
+            params = {"cursor": cursor_at(depth)} if depth else {}
+            keyset = await measure(client, "/api/v1/results", {**params, "limit": page_size}, repeats)
+            print(f"    depth={depth:>8}  offset p50={offset['p50_ms']}ms p99={offset['p99_ms']}ms"
+                  f"  keyset p50={keyset['p50_ms']}ms p99={keyset['p99_ms']}ms")
+
+        # The patient route has keyset pagination only; each patient owns 1/PATIENTS of the rows
+        print("/results/patient/BENCH0")
+        for depth in sorted({depth // PATIENTS for depth in depths}):
+            params = {"cursor": cursor_at(depth, "BENCH0")} if depth else {}
+            keyset = await measure(client, "/api/v1/results/patient/BENCH0", {**params, "limit": page_size}, repeats)
+            print(f"    depth={depth:>8}  keyset p50={keyset['p50_ms']}ms p99={keyset['p99_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--depths", nargs="+", type=int, default=[0, 1000, 10000, 100000, 190000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    started = time.perf_counter()
+    seed(args.rows)
+    print(f"Seeded {args.rows} predictions in {time.perf_counter() - started:.1f}s")
+    asyncio.run(run([d for d in args.depths if d < args.rows], args.page_size, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
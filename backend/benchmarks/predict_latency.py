@@ -0,0 +1,118 @@
+"""
+Load benchmark for POST /predict
+
+Runs the app in-process and fires concurrent /predict calls while polling
+/health. The run is repeated for each executor kind (``inline`` runs inference
+on the event loop, the previous behaviour) and micro-batch size, and p50/p99
+latency is printed for both endpoints.
+
+Usage (from the backend directory):
+    python -m benchmarks.predict_latency --requests 200 --concurrency 32 --model-latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.common import summarize, use_scratch_database
+
+use_scratch_database()
+
+import httpx  # noqa: E402
+
+from app.db.database import create_tables  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import batching as batching_module  # noqa: E402
+from app.services import inference_executor as executor_module  # noqa: E402
+from app.services.batching import MicroBatcher  # noqa: E402
+from app.services.inference_executor import InferenceExecutor  # noqa: E402
+from app.services.ml_service import MLModelService, run_prediction_batch  # noqa: E402
+
+
+def simulate_model_latency(seconds: float):
+    """Wrap MLModelService.predict_batch with a blocking per-call sleep to emulate a real model"""
+    original = MLModelService.predict_batch
+
+    def slow_predict_batch(self, patient_records, image_paths=None):
+        time.sleep(seconds)
+        return original(self, patient_records, image_paths)
+
+    MLModelService.predict_batch = slow_predict_batch
+
+
+async def run_load(total: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    predict_latencies = []
+    health_latencies = []
+    rejected = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def predict(i: int):
+            nonlocal rejected
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/predict",
+                    json={"patient_id": f"BENCH{i % 50}", "age": 60 + i % 30, "gender": "female"},
+                    # Inputs repeat; skip the result cache so every request measures inference
+                    params={"bypass_cache": "true"},
+                )
+                if response.status_code == 503:
+                    rejected += 1
+                else:
+                    predict_latencies.append(time.perf_counter() - started)
+
+        async def poll_health():
+            while not done.is_set():
+                started = time.perf_counter()
+                await client.get("/api/v1/health")
+                health_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        poller = asyncio.create_task(poll_health())
+        started = time.perf_counter()
+        await asyncio.gather(*(predict(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+
+    return {
+        "throughput_rps": round(total / elapsed, 1),
+        "rejected": rejected,
+        "predict": summarize(predict_latencies),
+        "health": summarize(health_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--model-latency", type=float, default=0.05, help="Simulated inference time in seconds")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue", type=int, default=256)
+    parser.add_argument("--executors", nargs="+", default=["inline", "thread"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 32], help="Micro-batch sizes to compare (1 = no batching)")
+    parser.add_argument("--batch-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    create_tables()
+    simulate_model_latency(args.model_latency)
+
+    for kind in args.executors:
+        for batch_size in args.batch_sizes:
+            executor_module.inference_executor = InferenceExecutor(kind, args.workers, args.queue)
+            batching_module.prediction_batcher = MicroBatcher(run_prediction_batch, batch_size, args.batch_wait_ms)
+            stats = asyncio.run(run_load(args.requests, args.concurrency))
+            executor_module.inference_executor.shutdown()
+            print(f"[{kind}, batch={batch_size}] throughput={stats['throughput_rps']} req/s rejected={stats['rejected']}")
+            print(f"    /predict {stats['predict']}")
+            print(f"    /health  {stats['health']}")
+
+
+if __name__ == "__main__":
+    main()
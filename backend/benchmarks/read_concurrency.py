@@ -0,0 +1,124 @@
+"""
+Read endpoint concurrency benchmark: async vs sync database sessions
+
+Seeds the scratch database with ``--rows`` predictions, then sends
+GET /results/{id}, /results/patient/{patient_id} and /results from
+``--concurrency`` concurrent clients and prints throughput, p50/p99
+latency, and the worst event loop stall seen by a 5ms ticker running
+alongside. Each mode runs in its own process, since the engine is chosen
+at import time:
+
+- async: the read endpoints use the async engine (DB_ASYNC_READS=true)
+- sync: they use sync sessions, with queries run in the threadpool
+
+Usage (from the backend directory):
+    python -m benchmarks.read_concurrency --rows 50000 --concurrency 1 16 64
+    python -m benchmarks.read_concurrency --mode async
+"""
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import summarize, use_scratch_database
+
+MODES = ("async", "sync")
+PATIENTS = 100
+TICK = 0.005
+
+
+def endpoints(rows: int):
+    return {
+        "/results/{id}": lambda i: (f"/api/v1/results/{i % rows + 1}", {}),
+        "/results/patient": lambda i: (f"/api/v1/results/patient/BENCH{i % PATIENTS}", {"limit": 10}),
+        "/results": lambda i: ("/api/v1/results", {"limit": 50}),
+    }
+
+
+async def loop_lag(stop: asyncio.Event) -> float:
+    """Longest delay of a periodic TICK sleep beyond its due time"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        worst = max(worst, time.perf_counter() - started - TICK)
+    return worst
+
+
+async def measure(client, request_for, concurrency: int, total: int):
+    latencies = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            path, params = request_for(i)
+            started = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return summarize(latencies), total / elapsed, await ticker
+
+
+async def run(mode: str, rows: int, levels, requests: int):
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, request_for in endpoints(rows).items():
+            for concurrency in levels:
+                latency, throughput, lag = await measure(client, request_for, concurrency, requests)
+                print(
+                    f"{mode:<5} {name:<17} concurrency={concurrency:<4} {throughput:>7,.0f} req/s  "
+                    f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms  max loop stall={lag * 1000:.1f}ms"
+                )
+
+
+def run_mode(args):
+    """Benchmark one mode in this process"""
+    use_scratch_database()
+    os.environ["DB_ASYNC_READS"] = "true" if args.mode == "async" else "false"
+    os.environ.setdefault("PREDICTION_QUEUE_ENABLED", "false")
+    logging.disable(logging.INFO)
+
+    from app.db.database import AsyncSessionLocal
+    from benchmarks.pagination import seed
+
+    if args.mode == "async" and AsyncSessionLocal is None:
+        raise SystemExit("Async reads are unavailable (pip install aiosqlite)")
+    seed(args.rows)
+    asyncio.run(run(args.mode, args.rows, args.concurrency, args.requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=MODES + ("both",), default="both")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and concurrency level")
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        run_mode(args)
+        return
+
+    # The engine is picked when app.db is imported, so each mode runs in a fresh process and database
+    for mode in MODES:
+        command = [sys.executable, "-m", "benchmarks.read_concurrency", "--mode", mode, "--rows", str(args.rows),
+                   "--requests", str(args.requests), "--concurrency", *map(str, args.concurrency)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
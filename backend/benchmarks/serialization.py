@@ -0,0 +1,186 @@
+"""
+Encode time of GET /results?limit=100
+
+Seeds the scratch database with completed predictions (with realistic
+``input_data``/``result_data`` JSON), then times building one page of
+``--limit`` predictions four ways:
+
+- legacy: full ORM objects, PredictionResponse built field by field, then
+  what FastAPI does with a returned list of models (dump, re-validate,
+  serialize) and json.dumps
+- orjson: the same, with ORJSONResponse's orjson.dumps as the encoder
+- validated: the response columns only, validated into PredictionResponse
+  from the row attributes (from_attributes) and dumped by pydantic
+- projection: the response columns only, mapped straight to the response
+  document and encoded with orjson (what the endpoint does now)
+
+Each is split into query (fetch and hydrate) and encode time. Finally the
+whole request is timed through the ASGI app.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --rows 20000 --limit 100
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from benchmarks.common import summarize, use_scratch_database
+
+use_scratch_database()
+
+import httpx  # noqa: E402
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.api.v1.endpoints.predictions import RESPONSE_COLUMNS, _serialize_rows  # noqa: E402
+from app.db.database import SessionLocal, create_tables, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Prediction  # noqa: E402
+from app.schemas.prediction import PredictionResponse, PredictionResult, PredictionStatus  # noqa: E402
+
+SEED_CHUNK = 5000
+RESPONSE_LIST = TypeAdapter(List[PredictionResponse])
+
+
+def seed(rows: int):
+    create_tables()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as connection:
+        for offset in range(0, rows, SEED_CHUNK):
+            connection.execute(
+                Prediction.__table__.insert(),
+                [
+                    {
+                        "patient_id": f"BENCH{i % 100}",
+                        "status": "completed",
+                        "has_alzheimer": i % 2,
+                        "confidence_score": 0.5 + (i % 50) / 100,
+                        "risk_level": ("low", "moderate", "high")[i % 3],
+                        "processing_time": 0.012,
+                        "model_version": "v1.0.0",
+                        "input_data": {"patient_id": f"BENCH{i % 100}", "age": 50 + i % 45, "gender": "female",
+                                       "clinical_notes": "Progressive memory loss over 18 months. " * 4},
+                        "result_data": {"has_alzheimer": bool(i % 2), "confidence_score": 0.5, "risk_level": "high",
+                                        "processing_time": 0.012, "model_version": "v1.0.0",
+                                        "features": {"age": 50 + i % 45, "gender": 1}, "is_placeholder": False},
+                        "created_at": start + timedelta(seconds=i),
+                        "completed_at": start + timedelta(seconds=i, milliseconds=12),
+                    }
+                    for i in range(offset, min(rows, offset + SEED_CHUNK))
+                ],
+            )
+
+
+def legacy_response(prediction: Prediction) -> PredictionResponse:
+    """The field-by-field conversion the list endpoints used before projection"""
+    result = None
+    if prediction.status == PredictionStatus.COMPLETED.value:
+        result = PredictionResult(
+            has_alzheimer=bool(prediction.has_alzheimer),
+            confidence_score=prediction.confidence_score,
+            risk_level=prediction.risk_level,
+            processing_time=prediction.processing_time,
+            model_version=prediction.model_version,
+        )
+    return PredictionResponse(
+        id=prediction.id,
+        patient_id=prediction.patient_id,
+        status=PredictionStatus(prediction.status),
+        result=result,
+        error_message=prediction.error_message,
+        created_at=prediction.created_at,
+        completed_at=prediction.completed_at,
+    )
+
+
+def fastapi_content(models):
+    """FastAPI's serialize_response for a List[PredictionResponse] route: dump, validate, serialize"""
+    validated = RESPONSE_LIST.validate_python([model.model_dump() for model in models])
+    return RESPONSE_LIST.dump_python(validated, mode="json")
+
+
+def encode_json(content) -> bytes:
+    """JSONResponse.render"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def encode_orjson(content) -> bytes:
+    """ORJSONResponse.render"""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def page(columns, limit: int):
+    return select(*columns).order_by(Prediction.created_at.desc(), Prediction.id.desc()).limit(limit)
+
+
+def time_strategies(limit: int, repeats: int):
+    def orm_page(db):
+        return list(db.scalars(page([Prediction], limit)).all())
+
+    def column_page(db):
+        return list(db.execute(page(RESPONSE_COLUMNS, limit)).all())
+
+    strategies = {
+        "legacy": (orm_page, lambda predictions: encode_json(fastapi_content([legacy_response(p) for p in predictions]))),
+        "orjson": (orm_page, lambda predictions: encode_orjson(fastapi_content([legacy_response(p) for p in predictions]))),
+        "validated": (column_page, lambda rows: RESPONSE_LIST.dump_json(RESPONSE_LIST.validate_python(rows))),
+        "projection": (column_page, _serialize_rows),
+    }
+
+    bodies = {}
+    for name, (fetch, encode) in strategies.items():
+        query_times, encode_times = [], []
+        for _ in range(repeats):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                rows = fetch(db)
+                fetched = time.perf_counter()
+                bodies[name] = encode(rows)
+                encoded = time.perf_counter()
+            finally:
+                db.close()
+            query_times.append(fetched - started)
+            encode_times.append(encoded - fetched)
+        query, encode_ = summarize(query_times), summarize(encode_times)
+        print(f"{name:<11} query p50={query['p50_ms']}ms  encode p50={encode_['p50_ms']}ms p99={encode_['p99_ms']}ms  "
+              f"({len(bodies[name]):,} bytes)")
+
+    # Every strategy must produce the same document
+    documents = [json.loads(body) for body in bodies.values()]
+    assert all(document == documents[0] for document in documents), "Response bodies differ"
+
+
+async def time_endpoint(limit: int, repeats: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            response = await client.get("/api/v1/results", params={"limit": limit})
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+    latency = summarize(latencies)
+    print(f"GET /results?limit={limit}  p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    seed(args.rows)
+    time_strategies(args.limit, args.repeats)
+    asyncio.run(time_endpoint(args.limit, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
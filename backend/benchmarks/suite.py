@@ -0,0 +1,241 @@
+"""
+API benchmark suite with baseline comparison
+
+Drives /health, /predict, /upload and /results (keyset pagination) at a
+fixed concurrency and reports throughput, latency percentiles, errors and
+worker memory (RSS from /health) for each scenario. The app runs in-process
+against a scratch database by default, or pass ``--url`` to benchmark a
+running server, e.g. one started with:
+
+    uvicorn app.main:app --port 8000
+
+Results can be saved as a baseline and later runs compared against it; the
+process exits with status 1 when a scenario's throughput drops or its p99
+latency grows by more than ``--tolerance``.
+
+Usage (from the backend directory):
+    python -m benchmarks.suite --save-baseline benchmarks/baselines/local.json
+    python -m benchmarks.suite --compare benchmarks/baselines/local.json
+    python -m benchmarks.suite --url http://127.0.0.1:8000 --scenarios predict upload --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import summarize, use_scratch_database
+
+SCENARIOS = ("health", "predict", "upload", "results")
+
+# Synthetic upload payloads sized like real scans
+UPLOAD_PAYLOADS = {
+    "dicom": (".dcm", 512 * 1024),  # One 512x512 16-bit slice
+    "nifti": (".nii", 16 * 1024 * 1024),  # A 256x256x128 16-bit volume
+}
+
+
+def build_client(url: Optional[str]):
+    """HTTP client for a running server, or for the app in-process"""
+    import httpx
+
+    timeout = httpx.Timeout(120.0)
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+
+    from app.db.database import create_tables
+    from app.main import app
+
+    # The in-process app runs without its startup hook
+    create_tables()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=timeout)
+
+
+async def process_rss(client) -> Optional[int]:
+    response = await client.get("/api/v1/health")
+    return response.json().get("process", {}).get("rss_bytes")
+
+
+async def seed_results(client, rows: int, page_size: int) -> List[Optional[str]]:
+    """Create ``rows`` predictions, then walk /results once to collect every page cursor"""
+    for start in range(0, rows, 5000):
+        batch = [
+            {"patient_id": f"SEED{i % 500}", "age": 50 + i % 40, "gender": "female"}
+            for i in range(start, min(rows, start + 5000))
+        ]
+        response = await client.post("/api/v1/predict/batch", json=batch)
+        response.raise_for_status()
+
+    cursors: List[Optional[str]] = [None]
+    while True:
+        params = {"limit": page_size}
+        if cursors[-1]:
+            params["cursor"] = cursors[-1]
+        response = await client.get("/api/v1/results", params=params)
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return cursors
+        cursors.append(cursor)
+
+
+def scenario_requests(name: str, args, cursors: List[Optional[str]]) -> Callable[[Any, int], Awaitable[Any]]:
+    """Request function for one scenario, called with (client, request index)"""
+    if name == "health":
+        return lambda client, i: client.get("/api/v1/health")
+
+    if name == "predict":
+        def predict(client, i):
+            return client.post(
+                "/api/v1/predict",
+                params={"bypass_cache": "true"},
+                json={"patient_id": f"BENCH{i % 100}", "age": 50 + i % 40, "gender": ("male", "female")[i % 2]},
+            )
+        return predict
+
+    if name == "upload":
+        extension, size = UPLOAD_PAYLOADS[args.upload_kind]
+        size = int(args.upload_size_mb * 1024 * 1024) if args.upload_size_mb else size
+        body = random.Random(0).randbytes(size)
+
+        def upload(client, i):
+            # A unique prefix keeps content-addressed storage from deduplicating the payloads
+            payload = i.to_bytes(8, "big") + body[8:]
+            return client.post("/api/v1/upload", files={"file": (f"bench{i}{extension}", payload)})
+        return upload
+
+    if name == "results":
+        def results(client, i):
+            params = {"limit": args.page_size}
+            cursor = cursors[i % len(cursors)]
+            if cursor:
+                params["cursor"] = cursor
+            return client.get("/api/v1/results", params=params)
+        return results
+
+    raise ValueError(f"Unknown scenario '{name}'")
+
+
+async def run_scenario(client, request: Callable[[Any, int], Awaitable[Any]], total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await request(client, i)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            if failed:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    rss_before = await process_rss(client)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    rss_after = await process_rss(client)
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 1),
+        "latency": summarize(latencies),
+        "rss_before_mb": round(rss_before / 2**20, 1) if rss_before else None,
+        "rss_after_mb": round(rss_after / 2**20, 1) if rss_after else None,
+    }
+
+
+async def run_suite(args) -> Dict[str, Any]:
+    results = {}
+    async with build_client(args.url) as client:
+        cursors: List[Optional[str]] = [None]
+        if "results" in args.scenarios:
+            cursors = await seed_results(client, args.seed_rows, args.page_size)
+
+        for name in args.scenarios:
+            total = args.upload_requests if name == "upload" else args.requests
+            request = scenario_requests(name, args, cursors)
+            # Warm up connections, caches and lazy imports outside the measurement
+            await run_scenario(client, request, min(total, args.concurrency), args.concurrency)
+            results[name] = await run_scenario(client, request, total, args.concurrency)
+            print_scenario(name, results[name])
+    return results
+
+
+def print_scenario(name: str, stats: Dict[str, Any]):
+    latency = stats["latency"]
+    print(
+        f"{name:<8} {stats['throughput_rps']:>9} req/s  p50={latency['p50_ms']}ms p90={latency['p90_ms']}ms "
+        f"p99={latency['p99_ms']}ms max={latency['max_ms']}ms  errors={stats['errors']}  "
+        f"rss={stats['rss_before_mb']}->{stats['rss_after_mb']}MB"
+    )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> bool:
+    """Print changes against the baseline; returns False if any scenario regressed"""
+    ok = True
+    print(f"\nCompared with baseline (tolerance {tolerance:.0%}):")
+    for name, stats in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            print(f"    {name:<8} no baseline")
+            continue
+
+        throughput_change = stats["throughput_rps"] / previous["throughput_rps"] - 1 if previous["throughput_rps"] else 0.0
+        p99_change = stats["latency"]["p99_ms"] / previous["latency"]["p99_ms"] - 1 if previous["latency"]["p99_ms"] else 0.0
+        regressed = throughput_change < -tolerance or p99_change > tolerance or stats["errors"] > previous["errors"]
+        ok = ok and not regressed
+        print(
+            f"    {name:<8} throughput {throughput_change:+.1%}  p99 {p99_change:+.1%}  "
+            f"errors {previous['errors']}->{stats['errors']}  {'REGRESSION' if regressed else 'ok'}"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running server instead of the app in-process")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--upload-requests", type=int, default=50)
+    parser.add_argument("--upload-kind", choices=sorted(UPLOAD_PAYLOADS), default="dicom")
+    parser.add_argument("--upload-size-mb", type=float, help="Override the synthetic payload size")
+    parser.add_argument("--seed-rows", type=int, default=5000, help="Predictions created for the results scenario")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--save-baseline", type=Path, help="Write this run's results to a JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative throughput/p99 change")
+    args = parser.parse_args()
+
+    if not args.url:
+        use_scratch_database()
+        import app.main  # noqa: F401  (configures logging on import; quieten it afterwards)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = asyncio.run(run_suite(args))
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        config = {key: value for key, value in vars(args).items() if key not in ("save_baseline", "compare")}
+        args.save_baseline.write_text(json.dumps({"config": config, "scenarios": results}, indent=2, default=str))
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
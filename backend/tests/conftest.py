@@ -0,0 +1,65 @@
+"""
+Test configuration
+
+Settings are read from the environment when ``app`` is first imported, so
+the scratch database, upload and cache directories are set here, before
+any test module imports the app. The queue worker and the model load at
+startup are disabled; tests drive them directly.
+"""
+import os
+import shutil
+import tempfile
+import pytest
+
+_scratch_dir = tempfile.mkdtemp(prefix="alzheimer-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_scratch_dir}/test.db",
+    UPLOAD_DIR=os.path.join(_scratch_dir, "uploads"),
+    PREPROCESS_CACHE_DIR=os.path.join(_scratch_dir, "tensors"),
+    PREDICTION_QUEUE_ENABLED="false",
+    MODEL_EAGER_LOAD="false",
+    MODEL_PATH=os.path.join(_scratch_dir, "missing-model.pkl"),
+)
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.db import create_tables
+    from app.main import app
+
+    create_tables()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(app):
+    from app.db import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_state(app):
+    """Empty the tables, upload directory and in-process caches after each test"""
+    yield
+    from app.db import Base, engine
+    from app.services import get_response_cache, get_result_cache
+
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    get_response_cache().clear()
+    get_result_cache().clear()
+    shutil.rmtree(os.environ["UPLOAD_DIR"], ignore_errors=True)
@@ -0,0 +1,51 @@
+from sqlalchemy.exc import OperationalError
+from app.db import commit_with_retry
+from app.models import Prediction
+
+
+def batch_request(patient_id: str, **fields) -> dict:
+    return {"patient_id": patient_id, "age": 70, "gender": "male", **fields}
+
+
+def test_batch_rows_keep_input_order(client, db):
+    requests = [batch_request(f"P-{i}") for i in range(20)]
+
+    body = client.post("/api/v1/predict/batch", json=requests).json()
+
+    assert body["total"] == 20 and body["failed"] == 0
+    for i, item in enumerate(body["items"]):
+        assert item["index"] == i
+        row = db.get(Prediction, item["prediction"]["id"])
+        assert row.patient_id == f"P-{i}"
+        assert row.status == "completed"
+
+
+def test_failed_items_do_not_fail_the_batch(client, db):
+    requests = [
+        batch_request("P-0"),
+        batch_request("P-1", model_version="no-such-version"),
+        batch_request("P-2", image_path="/nonexistent/scan.png"),
+    ]
+
+    body = client.post("/api/v1/predict/batch", json=requests).json()
+
+    assert (body["completed"], body["failed"]) == (1, 2)
+    errors = [item["error"] for item in body["items"]]
+    assert errors[0] is None
+    assert "no-such-version not found" in errors[1]
+    assert "Image not found" in errors[2]
+    assert db.query(Prediction).filter(Prediction.status == "failed").count() == 2
+
+
+def test_commit_with_retry_reruns_work_after_a_lock_error(db):
+    attempts = []
+
+    def work():
+        attempts.append(1)
+        db.add(Prediction(patient_id=f"P-{len(attempts)}", status="pending"))
+        if len(attempts) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return len(attempts)
+
+    assert commit_with_retry(db, retries=2, work=work) == 2
+    assert [row.patient_id for row in db.query(Prediction)] == ["P-2"]
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import pytest
+from app.services import InferenceExecutor, MicroBatcher
+
+
+class RecordingBatchFn:
+    """Batch function that echoes each record and remembers the batches it ran"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, records, image_paths, model_version):
+        self.batches.append(([record["id"] for record in records], model_version))
+        return [
+            ValueError(f"bad record {record['id']}") if record.get("bad") else {"id": record["id"], "model": model_version}
+            for record in records
+        ]
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor("thread", max_workers=2, max_queue=8)
+    yield executor
+    executor.shutdown()
+
+
+def submit_all(batcher, records, model_versions=None):
+    async def run():
+        versions = model_versions or [None] * len(records)
+        return await asyncio.gather(
+            *(batcher.submit(record, None, version) for record, version in zip(records, versions)),
+            return_exceptions=True,
+        )
+
+    return asyncio.run(run())
+
+
+def test_full_batch_flushes_without_waiting(executor):
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=10_000, executor=executor)
+
+    started = time.perf_counter()
+    results = submit_all(batcher, [{"id": i} for i in range(8)])
+
+    assert time.perf_counter() - started < 5
+    assert sorted(ids for ids, _ in batch_fn.batches) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    assert [result["id"] for result in results] == list(range(8))
+
+
+def test_partial_batch_flushes_after_max_wait(executor):
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=32, max_wait_ms=50, executor=executor)
+
+    started = time.perf_counter()
+    results = submit_all(batcher, [{"id": i} for i in range(3)])
+
+    assert time.perf_counter() - started >= 0.05
+    assert batch_fn.batches == [([0, 1, 2], None)]
+    assert [result["id"] for result in results] == [0, 1, 2]
+    assert batcher.pending == 0
+
+
+def test_failed_items_only_fail_their_callers(executor):
+    batcher = MicroBatcher(RecordingBatchFn(), max_batch_size=3, max_wait_ms=10_000, executor=executor)
+
+    results = submit_all(batcher, [{"id": 0}, {"id": 1, "bad": True}, {"id": 2}])
+
+    assert results[0] == {"id": 0, "model": None}
+    assert isinstance(results[1], ValueError) and "bad record 1" in str(results[1])
+    assert results[2] == {"id": 2, "model": None}
+
+
+def test_batch_function_error_fails_the_whole_batch(executor):
+    def broken(records, image_paths, model_version):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(broken, max_batch_size=2, max_wait_ms=10_000, executor=executor)
+
+    results = submit_all(batcher, [{"id": 0}, {"id": 1}])
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_model_versions_never_share_a_batch(executor):
+    batch_fn = RecordingBatchFn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=32, max_wait_ms=20, executor=executor)
+
+    results = submit_all(batcher, [{"id": i} for i in range(4)], ["v1", "v2", "v1", "v2"])
+
+    assert sorted(batch_fn.batches) == [([0, 2], "v1"), ([1, 3], "v2")]
+    assert [result["model"] for result in results] == ["v1", "v2", "v1", "v2"]
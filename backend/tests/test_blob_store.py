@@ -0,0 +1,60 @@
+import hashlib
+from pathlib import Path
+from app.models import UploadBlob
+from app.services.upload_storage import release_blob, store_blob, temporary_upload_path
+
+DATA = b"patient,age\n1,42\n"
+CONTENT_HASH = hashlib.sha256(DATA).hexdigest()
+
+
+def store(db, data: bytes = DATA) -> dict:
+    part_path = temporary_upload_path()
+    part_path.write_bytes(data)
+    return store_blob(db, part_path, hashlib.sha256(data).hexdigest(), ".CSV", len(data))
+
+
+def ref_count(db, filename: str):
+    db.expire_all()
+    blob = db.query(UploadBlob).filter(UploadBlob.filename == filename).first()
+    return None if blob is None else blob.ref_count
+
+
+def test_same_content_is_stored_once_with_two_references(db):
+    first = store(db)
+    second = store(db)
+
+    assert first["filename"] == second["filename"] == f"{CONTENT_HASH}.csv"
+    assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+    assert db.query(UploadBlob).count() == 1
+    assert ref_count(db, first["filename"]) == 2
+    assert [path.name for path in Path(first["file_path"]).parent.glob("*.csv")] == [first["filename"]]
+
+
+def test_blob_is_removed_with_its_last_reference(db):
+    filename = store(db)["filename"]
+    path = Path(store(db)["file_path"])
+
+    assert release_blob(db, filename) == 1
+    assert path.read_bytes() == DATA
+    assert ref_count(db, filename) == 1
+
+    assert release_blob(db, filename) == 0
+    assert not path.exists()
+    assert ref_count(db, filename) is None
+
+
+def test_untracked_files_are_not_released(db):
+    assert release_blob(db, "not-a-blob.csv") is None
+
+
+def test_delete_endpoint_keeps_shared_files(client, db):
+    filename = store(db)["filename"]
+    store(db)
+
+    first = client.delete(f"/api/v1/upload/{filename}")
+    assert first.status_code == 200
+    assert first.json()["remaining_references"] == 1
+
+    last = client.delete(f"/api/v1/upload/{filename}")
+    assert last.json()["remaining_references"] == 0
+    assert client.delete(f"/api/v1/upload/{filename}").status_code == 404
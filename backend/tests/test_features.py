@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from app.services.features import (
+    CategoricalFeature,
+    FeaturePipeline,
+    KeywordFeature,
+    NumericFeature,
+    default_feature_pipeline,
+)
+
+
+def test_prepare_reports_errors_per_row():
+    pipeline = FeaturePipeline([
+        NumericFeature("age", min_value=0, max_value=150),
+        CategoricalFeature("gender", categories=["male", "female"]),
+    ])
+    records = [
+        {"age": 40, "gender": "male"},
+        {"gender": "female"},
+        {"age": "old", "gender": "male"},
+        {"age": 200, "gender": "female"},
+        {"age": 30},
+        {"age": 25, "gender": "Female"},
+    ]
+
+    matrix, errors = pipeline.prepare(records)
+
+    assert matrix.shape == (6, 2)
+    assert sorted(errors) == [1, 2, 3, 4]
+    assert str(errors[1]) == "Missing required field: age"
+    assert str(errors[2]) == "Age must be a number"
+    assert str(errors[3]) == "Age must be between 0 and 150"
+    assert str(errors[4]) == "Missing required field: gender"
+    assert matrix[0].tolist() == [40.0, 0.0]
+    assert matrix[5].tolist() == [25.0, 1.0]
+
+
+def test_categorical_unknown_and_missing_values():
+    feature = CategoricalFeature("gender", categories=["Male", "female"], unknown_code=-1)
+    column = np.array(["male", "FEMALE", "robot", None], dtype=object)
+
+    assert feature.transform(column).tolist() == [0.0, 1.0, -1.0, -1.0]
+    assert [mask.tolist() for mask, _ in feature.invalid(column)] == [[False, False, False, True]]
+    assert CategoricalFeature("gender", categories=["male"], required=False).invalid(column) == []
+
+
+def test_categorical_fit_learns_categories():
+    feature = CategoricalFeature("smoker").fit(np.array(["yes", "No", None, "no"], dtype=object))
+
+    assert feature.categories == ["no", "yes"]
+    assert feature.transform(np.array(["YES", "no", "maybe"], dtype=object)).tolist() == [1.0, 0.0, -1.0]
+
+
+def test_pipeline_round_trips_through_dict_and_json():
+    pipeline = FeaturePipeline([
+        NumericFeature("age", min_value=0, max_value=150),
+        NumericFeature("bmi", required=False),
+        CategoricalFeature("gender", categories=["male", "female", "other"]),
+        KeywordFeature("pain", field="symptoms", keywords=["pain", "ache"]),
+    ])
+    records = [
+        {"age": 50, "bmi": 22.5, "gender": "other", "symptoms": "Chest pain and back ache"},
+        {"age": 60, "bmi": 30.0, "gender": "male", "symptoms": None},
+        {"age": 70, "gender": "female", "symptoms": "painless"},
+    ]
+    pipeline.fit(records)
+
+    restored = FeaturePipeline.from_dict(pipeline.to_dict())
+    reloaded = FeaturePipeline.from_json(pipeline.to_json())
+
+    assert restored.to_dict() == pipeline.to_dict()
+    assert reloaded.to_dict() == pipeline.to_dict()
+    assert np.array_equal(restored.transform(records), pipeline.transform(records))
+    assert pipeline.transform(records)[:, 1].tolist() == [22.5, 30.0, 26.25]
+    assert pipeline.transform(records)[:, 3].tolist() == [2.0, 0.0, 0.0]
+
+
+def test_default_pipeline_matches_the_original_encoding():
+    pipeline = default_feature_pipeline()
+    records = [
+        {"age": 30, "gender": "male"},
+        {"age": 40, "gender": "Female"},
+        {"age": 50, "gender": "other"},
+        {"age": 60, "gender": "unspecified"},
+    ]
+
+    matrix, errors = pipeline.prepare(records)
+
+    assert pipeline.names == ["age", "gender"]
+    assert errors == {}
+    assert matrix.tolist() == [[30.0, 0.0], [40.0, 1.0], [50.0, 2.0], [60.0, -1.0]]
+    assert np.array_equal(pipeline.transform(pd.DataFrame(records)), matrix)
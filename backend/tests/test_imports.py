@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def modules_after_import(module: str):
+    """Modules loaded by a fresh interpreter after importing ``module``"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_app_import_loads_no_ml_libraries():
+    modules = modules_after_import("app.main")
+    for library in ("numpy", "pandas", "sklearn", "joblib", "scipy", "onnxruntime"):
+        assert library not in modules
+
+
+def test_services_package_imports_services_on_access():
+    modules = modules_after_import("app.services")
+    assert not {name for name in modules if name.startswith("app.services.")}
@@ -0,0 +1,37 @@
+def scrape(client) -> dict:
+    """Unlabelled samples of /metrics by name"""
+    samples = {}
+    for line in client.get("/metrics").text.splitlines():
+        if line and not line.startswith("#") and "{" not in line:
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_database_pool_metrics_are_exported(client):
+    before = scrape(client).get("db_pool_checkout_wait_seconds_count", 0)
+    client.get("/api/v1/results")
+
+    samples = scrape(client)
+    assert samples["db_pool_checkout_wait_seconds_count"] > before
+    assert samples["db_pool_size"] >= 1
+    assert samples["db_pool_checked_out"] == 0
+    assert "db_pool_overflow" in samples
+
+
+def test_commit_lock_retries_are_counted(client, db):
+    from sqlalchemy.exc import OperationalError
+    from app.db import commit_with_retry
+
+    before = scrape(client)
+    attempts = []
+
+    def work():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    commit_with_retry(db, retries=1, work=work)
+
+    after = scrape(client)
+    assert after["db_commit_lock_retries_total"] == before.get("db_commit_lock_retries_total", 0) + 1
@@ -0,0 +1,38 @@
+from unittest import mock
+import numpy as np
+import pytest
+from app.services import FeaturePipeline, MLModelService
+from app.services.features import NumericFeature
+
+RECORD = {"patient_id": "P-1", "age": 70, "gender": "male"}
+
+
+def test_images_are_not_decoded_without_image_features(tmp_path):
+    path = tmp_path / "scan.png"
+    path.write_bytes(b"not decodable")
+    service = MLModelService()
+    with mock.patch("app.services.ml_service.get_image_preprocessor") as preprocessor:
+        result = service.predict_batch([RECORD], [str(path)])[0]
+
+    preprocessor.assert_not_called()
+    assert result["image_shape"] is None
+
+
+def test_missing_image_fails_only_its_item(tmp_path):
+    results = MLModelService().predict_batch([RECORD, RECORD], [str(tmp_path / "missing.png"), None])
+
+    assert isinstance(results[0], ValueError)
+    assert "Image not found" in str(results[0])
+    assert results[1]["has_alzheimer"] in (True, False)
+
+
+def test_images_are_decoded_for_image_features(tmp_path):
+    image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "scan.png"
+    image.fromarray(np.arange(64, dtype=np.uint8).reshape(8, 8)).save(path)
+    service = MLModelService()
+    service.feature_pipeline = FeaturePipeline([NumericFeature("age"), NumericFeature("image_mean")])
+
+    result = service.predict_batch([RECORD], [str(path)])[0]
+
+    assert result["image_shape"] is not None
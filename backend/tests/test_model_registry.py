@@ -0,0 +1,55 @@
+import pytest
+from app.services import FeaturePipeline, get_model_registry, save_model_artifact
+from app.services.features import NumericFeature
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    from sklearn.linear_model import LogisticRegression
+
+    pipeline = FeaturePipeline([NumericFeature("age")])
+    model = LogisticRegression().fit([[50], [60], [70], [80]], [0, 0, 1, 1])
+    return save_model_artifact(model, pipeline, str(tmp_path / "model.pkl"))
+
+
+@pytest.fixture
+def registry(app):
+    registry = get_model_registry()
+    yield registry
+    for version in ("test-good", "test-broken"):
+        registry.unload(version)
+
+
+def test_load_swaps_in_a_loaded_model(client, registry, model_file):
+    registry.register("test-good", model_file)
+
+    response = client.post("/api/v1/models/test-good/load")
+
+    assert response.status_code == 200
+    assert registry.peek("test-good").is_loaded
+
+
+def test_failed_reload_keeps_the_previous_instance(client, registry, model_file, tmp_path):
+    registry.register("test-good", model_file)
+    client.post("/api/v1/models/test-good/load")
+    previous = registry.peek("test-good")
+
+    with open(model_file, "wb") as corrupt:
+        corrupt.write(b"not a pickle")
+    response = client.post("/api/v1/models/test-good/load")
+
+    assert response.status_code == 500
+    assert "failed to load" in response.json()["detail"]
+    assert registry.peek("test-good") is previous
+
+
+def test_broken_model_cannot_be_loaded_or_activated(client, registry, tmp_path):
+    broken = tmp_path / "broken.pkl"
+    broken.write_bytes(b"not a pickle")
+    registry.register("test-broken", str(broken))
+    active = registry.active_version
+
+    assert client.post("/api/v1/models/test-broken/load?activate=true").status_code == 500
+    assert registry.peek("test-broken") is None
+    assert client.post("/api/v1/models/test-broken/activate").status_code == 500
+    assert registry.active_version == active
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+from app.models import Prediction
+
+
+def add_predictions(db, patient_id: str = "P-1", count: int = 7) -> list:
+    """Predictions with pairwise-equal created_at (ties are broken by id), newest first"""
+    base = datetime(2024, 1, 1)
+    predictions = [
+        Prediction(patient_id=patient_id, status="completed", created_at=base + timedelta(minutes=i // 2))
+        for i in range(count)
+    ]
+    db.add_all(predictions)
+    db.commit()
+    return sorted(predictions, key=lambda p: (p.created_at, p.id), reverse=True)
+
+
+def collect_pages(client, url: str, limit: int):
+    """Ids of every page, following X-Next-Cursor until a short page"""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        if "X-Next-Cursor" not in response.headers:
+            return pages
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+def test_keyset_pages_cover_every_row_once_newest_first(client, db):
+    expected = [p.id for p in add_predictions(db)]
+
+    pages = collect_pages(client, "/api/v1/results", limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [pid for page in pages for pid in page] == expected
+
+
+def test_full_last_page_is_followed_by_an_empty_page(client, db):
+    expected = [p.id for p in add_predictions(db, count=4)]
+
+    pages = collect_pages(client, "/api/v1/results", limit=2)
+
+    assert pages == [expected[:2], expected[2:], []]
+
+
+def test_patient_history_is_paginated_per_patient(client, db):
+    expected = [p.id for p in add_predictions(db, "P-1", count=5)]
+    add_predictions(db, "P-2", count=3)
+
+    pages = collect_pages(client, "/api/v1/results/patient/P-1", limit=2)
+
+    assert [pid for page in pages for pid in page] == expected
+
+
+def test_offset_pagination_still_works(client, db):
+    expected = [p.id for p in add_predictions(db)]
+
+    response = client.get("/api/v1/results", params={"skip": 2, "limit": 3})
+
+    assert [item["id"] for item in response.json()] == expected[2:5]
+
+
+def test_unknown_cursor_is_rejected(client, db):
+    add_predictions(db, count=2)
+
+    for url in ("/api/v1/results", "/api/v1/results/patient/P-1"):
+        response = client.get(url, params={"cursor": 999999})
+        assert response.status_code == 400
+        assert "Invalid cursor" in response.json()["detail"]
@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.models import Prediction
+from app.schemas.prediction import PredictionStatus
+from app.services import PredictionScheduler
+
+
+def add_prediction(db, status=PredictionStatus.PENDING, input_data=None, claimed_at=None) -> int:
+    prediction = Prediction(
+        patient_id="P-1",
+        status=status.value,
+        input_data=input_data,
+        claimed_at=claimed_at,
+    )
+    db.add(prediction)
+    db.commit()
+    return prediction.id
+
+
+def status_of(db, prediction_id: int) -> Prediction:
+    db.expire_all()
+    return db.get(Prediction, prediction_id)
+
+
+def test_claim_marks_pending_rows_processing(db):
+    prediction_id = add_prediction(db, input_data={"patient_id": "P-1", "age": 70})
+    scheduler = PredictionScheduler()
+
+    assert scheduler._claim_pending() == [(prediction_id, {"patient_id": "P-1", "age": 70})]
+    prediction = status_of(db, prediction_id)
+    assert prediction.status == PredictionStatus.PROCESSING.value
+    assert prediction.claimed_at is not None
+
+    # Already claimed
+    assert scheduler._claim_pending() == []
+
+
+def test_claim_respects_claim_size_and_order(db):
+    ids = [add_prediction(db, input_data={"patient_id": "P-1"}) for _ in range(5)]
+    scheduler = PredictionScheduler(claim_size=2)
+
+    assert [pid for pid, _ in scheduler._claim_pending()] == ids[:2]
+    assert [pid for pid, _ in scheduler._claim_pending()] == ids[2:4]
+
+
+def test_expired_claim_is_reclaimed(db):
+    stale = datetime.utcnow() - timedelta(seconds=600)
+    expired_id = add_prediction(db, PredictionStatus.PROCESSING, {"patient_id": "P-1"}, claimed_at=stale)
+    fresh_id = add_prediction(db, PredictionStatus.PROCESSING, {"patient_id": "P-1"}, claimed_at=datetime.utcnow())
+    scheduler = PredictionScheduler(claim_timeout=300)
+
+    assert [pid for pid, _ in scheduler._claim_pending()] == [expired_id]
+    assert status_of(db, fresh_id).status == PredictionStatus.PROCESSING.value
+
+
+def test_synchronous_predictions_are_never_claimed(db):
+    # Rows written by synchronous /predict carry no input_data
+    add_prediction(db, PredictionStatus.PROCESSING)
+    add_prediction(db, PredictionStatus.COMPLETED, {"patient_id": "P-1"})
+
+    assert PredictionScheduler(claim_timeout=0)._claim_pending() == []
+
+
+def test_release_returns_claim_to_pending(db):
+    prediction_id = add_prediction(db, input_data={"patient_id": "P-1"})
+    scheduler = PredictionScheduler()
+    scheduler._claim_pending()
+
+    scheduler._release([prediction_id])
+
+    prediction = status_of(db, prediction_id)
+    assert prediction.status == PredictionStatus.PENDING.value
+    assert prediction.claimed_at is None
+    assert [pid for pid, _ in scheduler._claim_pending()] == [prediction_id]
+
+
+def test_release_skips_finished_predictions(db):
+    running_id = add_prediction(db, PredictionStatus.PROCESSING, {"patient_id": "P-1"}, datetime.utcnow())
+    done_id = add_prediction(db, PredictionStatus.COMPLETED, {"patient_id": "P-1"}, datetime.utcnow())
+
+    PredictionScheduler()._release([running_id, done_id])
+
+    assert status_of(db, running_id).status == PredictionStatus.PENDING.value
+    assert status_of(db, done_id).status == PredictionStatus.COMPLETED.value
+
+
+def test_stop_returns_unfinished_claims_to_the_queue(db):
+    prediction_id = add_prediction(db, input_data={"patient_id": "P-1"})
+    scheduler = PredictionScheduler(poll_interval=0.01)
+    started = asyncio.Event()
+
+    async def process(pid, input_data):
+        started.set()
+        await asyncio.Event().wait()  # Never finishes
+
+    scheduler._process = process
+
+    async def run():
+        scheduler.start()
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    prediction = status_of(db, prediction_id)
+    assert prediction.status == PredictionStatus.PENDING.value
+    assert prediction.claimed_at is None
+    assert not scheduler._claimed
+
+
+def run_scheduler_until(scheduler, condition, timeout: float = 5.0):
+    """Run the scheduler until ``condition()`` holds, then stop it; returns whether it was still running"""
+    async def run():
+        scheduler.start()
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition():
+            assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+            await asyncio.sleep(0.01)
+        running = scheduler.is_running
+        await scheduler.stop()
+        return running
+
+    return asyncio.run(run())
+
+
+def test_failed_result_write_requeues_and_keeps_running(db):
+    prediction_id = add_prediction(db, input_data={"patient_id": "P-1", "age": 70, "gender": "male"})
+    scheduler = PredictionScheduler(poll_interval=0.01)
+    attempts = []
+
+    def finish(pid, result, error_message):
+        attempts.append(pid)
+        if len(attempts) == 1:
+            raise RuntimeError("database is gone")
+        PredictionScheduler._finish(scheduler, pid, result, error_message)
+
+    scheduler._finish = finish
+
+    assert run_scheduler_until(scheduler, lambda: status_of(db, prediction_id).status == "completed")
+    assert attempts == [prediction_id, prediction_id]
+
+
+def test_unexpected_errors_do_not_stop_the_scheduler(db):
+    ids = [add_prediction(db, input_data={"patient_id": "P-1"}) for _ in range(2)]
+    scheduler = PredictionScheduler(poll_interval=0.01)
+    claim = scheduler._claim_pending
+    polls = []
+    processed = []
+
+    def claim_pending():
+        polls.append(1)
+        if len(polls) == 1:
+            raise RuntimeError("claim failed")
+        return claim()
+
+    async def process(pid, input_data):
+        processed.append(pid)
+        if pid == ids[0]:
+            raise RuntimeError("boom")
+        return True
+
+    scheduler._claim_pending = claim_pending
+    scheduler._process = process
+
+    assert run_scheduler_until(scheduler, lambda: len(processed) == 2)
+    assert processed == ids
@@ -0,0 +1,61 @@
+import hashlib
+import os
+import numpy as np
+from app.services.preprocessing import TensorCache, content_hash_for
+from app.services.upload_storage import get_upload_dir
+
+FAKE_HASH = "a" * 64
+
+
+def test_store_blobs_are_hashed_by_name():
+    blob = get_upload_dir() / f"{FAKE_HASH}.csv"
+    blob.write_bytes(b"data")
+
+    assert content_hash_for(blob) == FAKE_HASH
+
+
+def test_other_files_are_hashed_from_disk(tmp_path):
+    path = tmp_path / f"{FAKE_HASH}.csv"  # Looks like a store blob, but is not in the store
+    path.write_bytes(b"first")
+    assert content_hash_for(path) == hashlib.sha256(b"first").hexdigest()
+
+    path.write_bytes(b"second version")
+    assert content_hash_for(path) == hashlib.sha256(b"second version").hexdigest()
+
+
+def test_tensor_cache_round_trip(tmp_path):
+    cache = TensorCache(str(tmp_path), max_bytes=1 << 20)
+    key = cache.key(FAKE_HASH, (2, 2, 2))
+    array = np.arange(8, dtype=np.float32).reshape(2, 2, 2)
+
+    assert cache.get(key) is None
+    cache.put(key, array)
+
+    np.testing.assert_array_equal(cache.get(key), array)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_tensor_cache_evicts_least_recently_used(tmp_path):
+    array = np.zeros(100)
+    cache = TensorCache(str(tmp_path), max_bytes=3000)
+    for key in ("a", "b", "c"):
+        cache.put(key, array)
+    cache.get("a")
+    cache.put("d", array)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.npy")) == ["a", "c", "d"]
+    assert cache.stats()["bytes"] == sum(path.stat().st_size for path in tmp_path.glob("*.npy"))
+
+
+def test_tensor_cache_rescans_for_other_workers_entries(tmp_path):
+    array = np.zeros(100)
+    cache = TensorCache(str(tmp_path), max_bytes=3000, rescan_seconds=0)
+    cache.put("a", array)
+    other_worker = TensorCache(str(tmp_path), max_bytes=3000, rescan_seconds=3600)
+    other_worker.put("b", array)
+    other_worker.put("c", array)
+    os.utime(tmp_path / "a.npy", (0, 0))  # Oldest
+
+    cache.put("d", array)
+
+    assert sorted(path.stem for path in tmp_path.glob("*.npy")) == ["b", "c", "d"]
@@ -0,0 +1,17 @@
+from unittest import mock
+from app.core import process_info
+
+
+def test_memory_without_proc_or_resource():
+    with mock.patch("builtins.open", side_effect=OSError), mock.patch.object(process_info, "resource", None):
+        memory = process_info.get_process_memory()
+
+    assert memory["rss_bytes"] is None
+    assert memory["pid"] > 0
+
+
+def test_memory_falls_back_to_peak_rss():
+    with mock.patch("builtins.open", side_effect=OSError):
+        memory = process_info.get_process_memory()
+
+    assert memory["rss_bytes"] > 0
@@ -0,0 +1,100 @@
+from unittest import mock
+from app.services import CachedResponse, ResponseCache, etag_matches, get_response_cache
+
+PATIENT = {"patient_id": "P-1", "age": 72, "gender": "female"}
+
+
+def page(body: bytes = b"[]") -> CachedResponse:
+    return CachedResponse(body)
+
+
+def test_history_is_dropped_when_the_patient_is_written():
+    cache = ResponseCache()
+    cache.put_history("P-1", 10, None, page(), cache.token())
+    cache.put_history("P-2", 10, None, page(), cache.token())
+
+    cache.invalidate_patient("P-1")
+
+    assert cache.get_history("P-1", 10, None) is None
+    assert cache.get_history("P-2", 10, None) is not None
+
+
+def test_read_that_raced_a_write_is_not_stored():
+    cache = ResponseCache()
+    token = cache.token()
+    cache.invalidate_patient("P-1")  # Lands while the read is querying
+
+    cache.put_history("P-1", 10, None, page(), token)
+    cache.put_history("P-2", 10, None, page(), token)
+
+    assert cache.get_history("P-1", 10, None) is None
+    assert cache.get_history("P-2", 10, None) is not None
+
+
+def test_forgotten_write_still_blocks_older_reads():
+    cache = ResponseCache(history_ttl_seconds=5.0)
+    with mock.patch("app.services.response_cache.time.monotonic", return_value=100.0):
+        token = cache.token()
+        cache.invalidate_patient("P-1")
+    with mock.patch("app.services.response_cache.time.monotonic", return_value=110.0):
+        cache.invalidate_patient("P-2")  # Prunes the record of the P-1 write
+        assert "P-1" not in cache._last_write
+
+        cache.put_history("P-1", 10, None, page(), token)
+        assert cache.get_history("P-1", 10, None) is None
+
+        cache.put_history("P-1", 10, None, page(), cache.token())
+        assert cache.get_history("P-1", 10, None) is not None
+
+
+def test_history_expires_after_the_ttl():
+    cache = ResponseCache(history_ttl_seconds=5.0)
+    with mock.patch("app.services.response_cache.time.monotonic", return_value=100.0):
+        cache.put_history("P-1", 10, None, page(), cache.token())
+    with mock.patch("app.services.response_cache.time.monotonic", return_value=106.0):
+        assert cache.get_history("P-1", 10, None) is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put_prediction(1, page())
+    cache.put_prediction(2, page())
+    cache.get_prediction(1)
+    cache.put_prediction(3, page())
+
+    assert cache.get_prediction(2) is None
+    assert cache.get_prediction(1) is not None
+    assert cache.get_prediction(3) is not None
+
+
+def test_etag_matching():
+    etag = page(b"[1]").etag
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(page(b"[2]").etag, etag)
+
+
+def test_result_lookup_answers_304_for_a_matching_etag(client):
+    prediction_id = client.post("/api/v1/predict", json=PATIENT).json()["id"]
+
+    first = client.get(f"/api/v1/results/{prediction_id}")
+    assert first.status_code == 200
+    second = client.get(f"/api/v1/results/{prediction_id}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_new_prediction_invalidates_cached_history(client):
+    client.post("/api/v1/predict", json=PATIENT)
+    first = client.get("/api/v1/results/patient/P-1")
+    assert len(first.json()) == 1
+    assert get_response_cache().get_history("P-1", 10, None) is not None
+
+    client.post("/api/v1/predict", json=PATIENT, params={"bypass_cache": "true"})
+    second = client.get("/api/v1/results/patient/P-1", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert len(second.json()) == 2
+    assert second.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,49 @@
+from unittest import mock
+from app.models import Prediction
+from app.services import ResultCache, get_result_cache, prediction_cache_key
+
+PATIENT = {"patient_id": "P-1", "age": 72, "gender": "female"}
+
+
+def test_key_ignores_field_order_but_not_values_or_version():
+    key = prediction_cache_key(PATIENT, None, "v1")
+
+    assert prediction_cache_key(dict(reversed(list(PATIENT.items()))), None, "v1") == key
+    assert prediction_cache_key({**PATIENT, "age": 73}, None, "v1") != key
+    assert prediction_cache_key(PATIENT, None, "v2") != key
+
+
+def test_key_uses_image_content_not_path(tmp_path):
+    first, second = tmp_path / "a.png", tmp_path / "b.png"
+    first.write_bytes(b"scan")
+    second.write_bytes(b"scan")
+    key = prediction_cache_key(PATIENT, str(first), "v1")
+
+    assert prediction_cache_key(PATIENT, str(second), "v1") == key
+    second.write_bytes(b"another scan")
+    assert prediction_cache_key(PATIENT, str(second), "v1") != key
+
+
+def test_entries_expire_and_are_evicted():
+    cache = ResultCache(max_entries=2, ttl_seconds=10.0)
+    with mock.patch("app.services.result_cache.time.monotonic", return_value=100.0):
+        cache.put("a", {"value": 1})
+        cache.put("b", {"value": 2})
+        cache.put("c", {"value": 3})
+        assert cache.get("a") is None
+        assert cache.get("b") == {"value": 2}
+    with mock.patch("app.services.result_cache.time.monotonic", return_value=111.0):
+        assert cache.get("b") is None
+    assert cache.evictions == 1
+
+
+def test_repeated_request_is_served_from_cache(client, db):
+    hits = get_result_cache().hits
+    first = client.post("/api/v1/predict", json=PATIENT).json()
+    second = client.post("/api/v1/predict", json=PATIENT).json()
+    bypassed = client.post("/api/v1/predict", json=PATIENT, params={"bypass_cache": "true"}).json()
+
+    assert second["result"]["has_alzheimer"] == first["result"]["has_alzheimer"]
+    assert get_result_cache().hits == hits + 1
+    cache_hits = [db.get(Prediction, body["id"]).result_data.get("cache_hit", False) for body in (first, second, bypassed)]
+    assert cache_hits == [False, True, False]
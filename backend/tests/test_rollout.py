@@ -0,0 +1,57 @@
+import pytest
+from app.services import ModelRegistry, ModelRollout
+
+ACTIVE = "v1"
+
+
+@pytest.fixture
+def rollout(tmp_path):
+    registry = ModelRegistry(ACTIVE, str(tmp_path / "v1.pkl"), str(tmp_path))
+    registry.register("v2", str(tmp_path / "v2.pkl"))
+    rollout = ModelRollout(registry)
+    rollout.configure(canary_version="v2", canary_percent=30, preload=False)
+    yield rollout
+    rollout.shadow_executor.shutdown()
+
+
+def test_canary_serves_its_share_of_patients(rollout):
+    routed = [rollout.route(None, f"P-{i}") for i in range(2000)]
+
+    share = sum(is_canary for _, is_canary in routed) / len(routed)
+    assert 0.25 < share < 0.35
+    assert {version for version, is_canary in routed if is_canary} == {"v2"}
+    assert {version for version, is_canary in routed if not is_canary} == {ACTIVE}
+
+
+def test_patient_always_gets_the_same_version(rollout):
+    assert len({rollout.route(None, "P-42") for _ in range(10)}) == 1
+
+
+def test_requested_version_bypasses_the_canary(rollout):
+    assert {rollout.route(ACTIVE, f"P-{i}") for i in range(200)} == {(ACTIVE, False)}
+
+
+def test_disabling_the_canary_routes_everything_to_the_active_version(rollout):
+    rollout.configure(preload=False)
+
+    assert {rollout.route(None, f"P-{i}") for i in range(200)} == {(ACTIVE, False)}
+
+
+def test_invalid_configuration_is_rejected(rollout):
+    with pytest.raises(KeyError):
+        rollout.configure(canary_version="v9", canary_percent=10, preload=False)
+    with pytest.raises(ValueError):
+        rollout.configure(canary_version="v2", canary_percent=101, preload=False)
+    with pytest.raises(KeyError):
+        rollout.route("v9", "P-1")
+
+    assert (rollout.canary_version, rollout.canary_percent) == ("v2", 30)
+
+
+def test_rollouts_can_be_created_repeatedly(tmp_path):
+    registry = ModelRegistry(ACTIVE, str(tmp_path / "v1.pkl"), str(tmp_path))
+    rollouts = [ModelRollout(registry) for _ in range(2)]
+
+    assert rollouts[0].shadow_runs is rollouts[1].shadow_runs
+    for rollout in rollouts:
+        rollout.shadow_executor.shutdown()
@@ -0,0 +1,132 @@
+import hashlib
+import os
+from pathlib import Path
+from app.services import UploadSessionStore, get_upload_session_store
+from app.services.upload_storage import SESSION_DIR_NAME, get_upload_dir
+
+DATA = b"0123456789" * 100
+
+
+def create_session(client, data: bytes = DATA) -> str:
+    response = client.post("/api/v1/upload/sessions", json={"filename": "scan.csv", "total_size": len(data)})
+    assert response.status_code == 201
+    assert response.json()["offset"] == 0
+    return response.json()["upload_id"]
+
+
+def put_chunk(client, upload_id: str, offset: int, chunk: bytes):
+    return client.put(f"/api/v1/upload/sessions/{upload_id}", params={"offset": offset}, content=chunk)
+
+
+def test_chunks_are_appended_until_the_file_is_stored(client):
+    upload_id = create_session(client)
+
+    first = put_chunk(client, upload_id, 0, DATA[:400])
+    assert first.status_code == 200
+    assert first.json()["offset"] == 400
+    assert "completed" not in first.json()
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").json()["offset"] == 400
+
+    last = put_chunk(client, upload_id, 400, DATA[400:]).json()
+    assert last["completed"] is True
+    assert last["content_hash"] == hashlib.sha256(DATA).hexdigest()
+    assert Path(last["file_path"]).read_bytes() == DATA
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").status_code == 404
+
+
+def test_chunk_at_the_wrong_offset_is_rejected(client):
+    upload_id = create_session(client)
+    put_chunk(client, upload_id, 0, DATA[:100])
+
+    response = put_chunk(client, upload_id, 50, DATA[50:150])
+
+    assert response.status_code == 409
+    assert "Offset mismatch" in response.json()["detail"]
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").json()["offset"] == 100
+
+
+def test_chunk_past_the_total_size_is_dropped(client):
+    upload_id = create_session(client)
+    put_chunk(client, upload_id, 0, DATA[:900])
+
+    response = put_chunk(client, upload_id, 900, DATA[900:] + b"extra")
+
+    assert response.status_code == 413
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").json()["offset"] == 900
+    assert put_chunk(client, upload_id, 900, DATA[900:]).json()["completed"] is True
+
+
+def test_concurrent_writer_gets_409(client):
+    upload_id = create_session(client)
+
+    with get_upload_session_store()._write_lock(upload_id):
+        response = put_chunk(client, upload_id, 0, DATA)
+
+    assert response.status_code == 409
+    assert put_chunk(client, upload_id, 0, DATA).json()["completed"] is True
+
+
+def test_identical_uploads_share_one_blob(client):
+    first = put_chunk(client, create_session(client), 0, DATA).json()
+    second = put_chunk(client, create_session(client), 0, DATA).json()
+
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert second["file_path"] == first["file_path"]
+
+
+def test_unknown_invalid_and_aborted_sessions(client):
+    assert client.get("/api/v1/upload/sessions/" + "0" * 32).status_code == 404
+    assert client.get("/api/v1/upload/sessions/not-an-id").status_code == 400
+    assert put_chunk(client, "0" * 32, 0, b"x").status_code == 404
+
+    upload_id = create_session(client)
+    assert client.delete(f"/api/v1/upload/sessions/{upload_id}").status_code == 200
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").status_code == 404
+
+
+def age(path: Path, seconds: float):
+    stat = path.stat()
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_sweep_deletes_only_idle_sessions(client):
+    store = UploadSessionStore(ttl_seconds=3600)
+    idle_id = create_session(client)
+    active_id = create_session(client)
+    session_dir = get_upload_dir() / SESSION_DIR_NAME
+    for suffix in (".json", ".part"):
+        age(session_dir / f"{idle_id}{suffix}", 7200)
+    orphan = session_dir / ("f" * 32 + ".part")
+    orphan.write_bytes(b"partial")
+    age(orphan, 7200)
+
+    assert store.sweep() == 1
+
+    assert client.get(f"/api/v1/upload/sessions/{idle_id}").status_code == 404
+    assert client.get(f"/api/v1/upload/sessions/{active_id}").status_code == 200
+    assert not orphan.exists()
+
+
+def test_sweep_skips_sessions_being_written(client):
+    store = get_upload_session_store()
+    upload_id = create_session(client)
+    session_dir = get_upload_dir() / SESSION_DIR_NAME
+    for suffix in (".json", ".part"):
+        age(session_dir / f"{upload_id}{suffix}", store.ttl_seconds + 60)
+
+    with store._write_lock(upload_id):
+        assert UploadSessionStore(ttl_seconds=store.ttl_seconds).sweep() == 0
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").status_code == 200
+
+
+def test_create_sweeps_expired_sessions(client):
+    store = get_upload_session_store()
+    upload_id = create_session(client)
+    for suffix in (".json", ".part"):
+        age(get_upload_dir() / SESSION_DIR_NAME / f"{upload_id}{suffix}", store.ttl_seconds + 60)
+    store._swept_at = None
+
+    create_session(client)
+
+    assert client.get(f"/api/v1/upload/sessions/{upload_id}").status_code == 404